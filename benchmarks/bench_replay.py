@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Offline benchmark of the workflows using a recorded cassette.
+
+The get_org_networks and create_networks workflows are recorded once against
+a local stand-in server (or loaded from an existing cassette), then replayed
+at the recorded speed and without waiting, so their own overhead can be
+measured repeatably without an API key.
+
+    python benchmarks/bench_replay.py [--cassette FILE] [--repeat 5]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'src',
+    'meraki_dashboard_python'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('MERAKI_API_KEY_HH', '')  # Required by utils import
+
+import standin  # noqa: E402
+from traininglabs import defaultlab  # noqa: E402
+from utilities import utils  # noqa: E402
+
+NET_SPECS = [
+    {'name': f'Replay {i}', 'type': 'appliance switch', 'tags': 'bench'}
+    for i in range(20)
+    ]
+
+
+def run_workflows(session: dict):
+    """Run the benchmarked workflows."""
+    dashboard = session['dashboardAPI']
+    org = session['organizations'][0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        utils.get_org_networks(dashboard, org['name'])
+        defaultlab.create_networks(dashboard, org, NET_SPECS)
+
+
+def record(path: str):
+    """Record the workflows against a local stand-in server."""
+    server = standin.serve(standin.make_inventory(orgs=1, networks=2000))
+    session = utils.init_dashboard_session(
+        'bench', base_url=standin.base_url(server, 'v0'), record=path)
+    run_workflows(session)
+    utils.close_session(session['dashboardAPI'])
+    server.shutdown()
+
+
+def main():
+    """Replay the workflows and print the timings."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cassette')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    path = args.cassette
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), 'workflows.jsonl')
+    if not os.path.exists(path):
+        record(path)
+        print(f'Recorded: {path}')
+
+    print(f"{'speed':>8} {'best seconds':>13}")
+    for speed in (1.0, 0):
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            session = utils.init_dashboard_session(
+                'replay', base_url=utils.BASE_URL, replay=path,
+                replay_speed=speed)
+            run_workflows(session)
+            best = min(best, time.perf_counter() - start)
+        print(f"{'recorded' if speed == 1 else 'instant':>8} {best:>13.4f}")
+
+
+if __name__ == '__main__':
+    main()
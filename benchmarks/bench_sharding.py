@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""Scaling benchmark of the sharded multi-process executor.
+
+Each organization's networks are fetched from a local stand-in server and
+validated with the utils helpers, on 1, 2, 4 and 8 worker processes.
+
+    python benchmarks/bench_sharding.py [--orgs 40] [--networks 2500]
+"""
+import argparse
+import functools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'src',
+    'meraki_dashboard_python'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('MERAKI_API_KEY_HH', '')  # Required by utils import
+
+import standin  # noqa: E402
+from utilities import dashboardv1, sharding, timezones, utils  # noqa: E402
+
+_DASHBOARD = None  # The worker process' API v1 session
+
+
+def audit_org(org_id: str, limiter, base_url: str) -> dict:
+    """Fetch and validate an organization's networks."""
+    global _DASHBOARD
+    if _DASHBOARD is None:
+        _DASHBOARD = dashboardv1.DashboardV1('bench', base_url=base_url)
+    limiter.acquire(org_id)
+    networks = _DASHBOARD.getOrganizationNetworks(org_id)
+    time_zones = set(timezones.TZ_LIST)
+    invalid = 0
+    for net in networks:
+        try:
+            utils.validate_net_name(net['name'])
+            utils.validate_tags(' '.join(net['tags']))
+            utils.validate_net_type(' '.join(net['productTypes']))
+        except ValueError:
+            invalid += 1
+        if net['timeZone'] not in time_zones:
+            invalid += 1
+    return {'networks': len(networks), 'invalid': invalid}
+
+
+def main():
+    """Run the benchmark and print the scaling table."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--orgs', type=int, default=40)
+    parser.add_argument('--networks', type=int, default=2500)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    server = standin.serve(standin.make_inventory(args.orgs, args.networks))
+    org_ids = list(server.inventory)
+    task = functools.partial(audit_org, base_url=standin.base_url(server))
+    print(f'CPU cores: {os.cpu_count()}, orgs: {args.orgs}, '
+          f'networks/org: {args.networks}')
+    print(f"{'workers':>8} {'seconds':>9} {'networks/s':>11} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        total = 0
+        for _, result, error in sharding.run_sharded(
+                task, org_ids, max_workers=workers, rate=1000):
+            if error is not None:
+                raise error
+            total += result['networks']
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f'{workers:>8} {elapsed:>9.2f} {total / elapsed:>11.0f} '
+              f'{baseline / elapsed:>7.2f}x')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
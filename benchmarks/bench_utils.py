@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+"""Micro-benchmarks of the utils helpers at MSP scale.
+
+Each helper of utilities/utils.py is run against synthetic organizations,
+networks, tags and device codes, and its time (best of the repeats) and its
+peak allocations (tracemalloc) are compared with the stored baseline. The
+times are compared relative to a calibration loop measured right before each
+workload, so the comparison holds when the machine is slower or busier than
+usual.
+
+    python benchmarks/bench_utils.py                   # compare
+    python benchmarks/bench_utils.py --save-baseline   # store a new baseline
+    python benchmarks/bench_utils.py --sizes 1000 1000000
+
+-> Exit with status 1 if a helper is slower, or allocates more, than its
+   baseline by more than the threshold (default 50%).
+** Note: the relative times still depend on the Python version, so store
+   the baseline with the interpreter running the comparison.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'src',
+    'meraki_dashboard_python'))
+os.environ.setdefault('MERAKI_API_KEY_HH', '')  # Required by utils import
+
+from utilities import batchvalidation, utils  # noqa: E402
+
+BASELINE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'baseline_utils.json')
+DEVICE_CODES = list(utils.PRODUCT_TYPES)
+NET_TYPES = list(utils.PRODUCT_TYPES.values())
+
+
+def gen_orgs(size: int, rand: random.Random) -> list:
+    """Generate an organizations list."""
+    return [
+        {'id': str(500000 + i), 'name': f'Org {rand.randrange(size)}',
+         'url': f'https://n1.meraki.com/o/{i}'}
+        for i in range(size)
+        ]
+
+
+def gen_networks(size: int, rand: random.Random) -> list:
+    """Generate an organization's networks list."""
+    return [
+        {'id': f'N_{i}', 'name': f'Branch {rand.randrange(size)}',
+         'productTypes': rand.sample(NET_TYPES, rand.randint(1, 3)),
+         'tags': ' '.join(f'tag{rand.randrange(100)}' for _ in range(3))}
+        for i in range(size)
+        ]
+
+
+def gen_workloads(size: int) -> dict:
+    """Generate the workload of each helper for a size.
+
+    -> Return a dict() of helper name -> callable running the workload.
+    """
+    rand = random.Random(size)
+    names = [f'Branch-{i} Site_{i % 97}.lab@{i % 7}#' for i in range(size)]
+    tags = [f'tag{i} site-{i % 97} prod_{i % 3}.x' for i in range(size)]
+    net_types = [
+        ' '.join(rand.sample(NET_TYPES, rand.randint(1, 3)))
+        for _ in range(size)
+        ]
+    codes = [rand.choice(DEVICE_CODES).upper() for _ in range(size)]
+    orgs = gen_orgs(size, rand)
+    networks = gen_networks(size, rand)
+    org_name = orgs[-1]['name']
+    net_name = networks[-1]['name']
+
+    def each(func, values):
+        return lambda: [func(value) for value in values]
+
+    return {
+        'validate_net_name': each(utils.validate_net_name, names),
+        'validate_tags': each(utils.validate_tags, tags),
+        'validate_net_type': each(utils.validate_net_type, net_types),
+        'validate_device_code': each(utils.validate_device_code, codes),
+        'filter_orgs': lambda: utils.filter_orgs(orgs, org_name),
+        'get_networks': lambda: [
+            utils.get_networks(networks, net_name, net_type)
+            for net_type in (0, 1, 2)],
+        'get_dict_values': lambda: utils.get_dict_values(
+            codes, {k.upper(): v for k, v in utils.PRODUCT_TYPES.items()}),
+        'batch_validate_columns': lambda: batchvalidation.validate_columns(
+            {'name': names, 'tags': tags, 'type': net_types,
+             'deviceCodes': codes}),
+        }
+
+
+def best_time(func, repeat: int) -> float:
+    """Get the best time of a workload in seconds.
+    ** Note: the garbage collector is disabled while timing, as timeit does.
+    """
+    best = float('inf')
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def calibrate(repeat: int) -> float:
+    """Get the best time of a fixed pure-Python reference loop in seconds."""
+    table = {str(i): i for i in range(1000)}
+    keys = list(table) * 100
+
+    def reference():
+        total = 0
+        for key in keys:
+            if key.isdigit():
+                total += table[key]
+        return total
+    return best_time(reference, repeat)
+
+
+def measure(func, repeat: int) -> dict:
+    """Measure a workload.
+
+    -> Return a dict() of the best time in seconds, the best time relative
+       to the calibration loop and the peak allocated bytes.
+    """
+    calibration = calibrate(repeat)
+    seconds = best_time(func, repeat)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seconds': seconds, 'relative': seconds / calibration,
+            'peak_bytes': peak}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Compare the results with the baseline.
+
+    -> Return a list of the regression messages.
+    """
+    regressions = list()
+    for case, result in results.items():
+        base = baseline.get(case)
+        if base is None:
+            continue
+        for metric in ('relative', 'peak_bytes'):
+            if result[metric] > base[metric] * (1 + threshold):
+                regressions.append(
+                    f'{case} {metric}: {result[metric]:.6g} > baseline '
+                    f'{base[metric]:.6g} (+{threshold:.0%})')
+    return regressions
+
+
+def main() -> int:
+    """Run the benchmarks.
+
+    -> Return the exit status.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--threshold', type=float, default=0.5)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    results = dict()
+    print(f"{'case':<32} {'seconds':>10} {'relative':>10} {'peak KiB':>10}")
+    for size in args.sizes:
+        for name, func in gen_workloads(size).items():
+            case = f'{name}[{size}]'
+            results[case] = measure(func, args.repeat)
+            print(f"{case:<32} {results[case]['seconds']:>10.4f} "
+                  f"{results[case]['relative']:>10.3f} "
+                  f"{results[case]['peak_bytes'] / 1024:>10.0f}")
+
+    if args.save_baseline:
+        baseline = dict()
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as baseline_file:
+                baseline = json.load(baseline_file)
+        baseline.update(results)
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(baseline, baseline_file, indent=4, sort_keys=True)
+        print(f'Baseline saved: {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'No baseline: {args.baseline}')
+        return 0
+    with open(args.baseline) as baseline_file:
+        regressions = compare(results, json.load(baseline_file),
+                              args.threshold)
+    for regression in regressions:
+        print(f'-> Regression: {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
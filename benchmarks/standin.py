@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""Local stand-in of the Meraki dashboard API v1.
+
+This module serves synthetic organizations, networks, devices and statuses
+from a local HTTP server, with the same Link header pagination as the
+Meraki dashboard API, so the benchmarks run offline without an API key.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PRODUCT_TYPES = ['appliance', 'switch', 'wireless', 'camera']
+
+
+def make_inventory(orgs: int, networks: int, devices: int = 0) -> dict:
+    """Build a synthetic inventory.
+
+    - orgs (integer): number of organizations.
+    - networks (integer): number of networks per organization.
+    - devices (integer): number of devices per network.
+    -> Return a dict() of org_id -> {'organization', 'networks', 'devices'}.
+    """
+    inventory = dict()
+    for o in range(orgs):
+        org_id = str(100000 + o)
+        nets = [
+            {'id': f'N_{org_id}_{n}',
+             'organizationId': org_id,
+             'name': f'Branch {n:05d}-{org_id}',
+             'productTypes': PRODUCT_TYPES[:1 + n % len(PRODUCT_TYPES)],
+             'timeZone': 'Australia/NSW',
+             'tags': [f'site{n % 50}', 'prod' if n % 3 else 'lab']}
+            for n in range(networks)
+            ]
+        devs = [
+            {'serial': f'Q2XX-{o:03d}{n:05d}-{d:03d}',
+             'model': ['MX68', 'MS120-8', 'MR33', 'MV12W'][d % 4],
+             'networkId': net['id'],
+             'status': 'online'}
+            for n, net in enumerate(nets) for d in range(devices)
+            ]
+        inventory[org_id] = {
+            'organization': {'id': org_id, 'name': f'Org {org_id}',
+                             'url': f'https://n1.meraki.com/o/{org_id}'},
+            'networks': nets,
+            'devices': devs
+            }
+    return inventory
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve the organization-wide GET endpoints of the inventory and the
+    network creation.
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = url.path.rstrip('/').split('/')
+        inventory = self.server.inventory
+        if parts[-1] == 'organizations':
+            self._send([v['organization'] for v in inventory.values()])
+            return
+        org_id = parts[parts.index('organizations') + 1]
+        section = 'networks' if parts[-1] == 'networks' else 'devices'
+        if org_id not in inventory:
+            self._send({'errors': ['Organization not found']}, status=404)
+            return
+        items = inventory[org_id][section]
+        per_page = int(query.get('perPage', ['1000'])[0])
+        start = int(query.get('startingAfter', ['0'])[0])
+        link = None
+        if start + per_page < len(items):
+            link = (
+                f'<http://{self.headers["Host"]}{url.path}?perPage='
+                f'{per_page}&startingAfter={start + per_page}>; rel=next')
+        self._send(items[start:start + per_page], link=link)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        parts = url.path.rstrip('/').split('/')
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        if parts[-1] == 'networks' and 'organizations' in parts:
+            org_id = parts[parts.index('organizations') + 1]
+            nets = self.server.inventory[org_id]['networks']
+            net_type = payload.get('type') or payload.get('productTypes')
+            network = {
+                'id': f'N_{org_id}_{len(nets)}',
+                'organizationId': org_id,
+                'name': payload['name'],
+                'productTypes': (net_type.split()
+                                 if isinstance(net_type, str) else net_type),
+                'timeZone': payload.get('timeZone'),
+                'tags': payload.get('tags')}
+            nets.append(network)
+            self._send(network, status=201)
+        else:
+            self._send({'errors': ['Not found']}, status=404)
+
+    def _send(self, data, status=200, link=None):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if link:
+            self.send_header('Link', link)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(inventory: dict) -> ThreadingHTTPServer:
+    """Start the stand-in server on a background thread.
+
+    -> Return the server; its API base URL is base_url(server).
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.inventory = inventory
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def base_url(server: ThreadingHTTPServer, version: str = 'v1') -> str:
+    """Get the API base URL of a stand-in server."""
+    return f'http://127.0.0.1:{server.server_port}/api/{version}'
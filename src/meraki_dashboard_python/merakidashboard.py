@@ -1,11 +1,59 @@
 #!/usr/bin/env python
 """Import required modules."""
-from traininglabs import defaultlab
+import argparse
+import json
+from utilities import daemonclient
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments.
+    ** Note: without a command, the default lab is run.
+    """
+    parser = argparse.ArgumentParser(description='Meraki dashboard workflows')
+    parser.add_argument('--socket', default=daemonclient.DEFAULT_SOCKET,
+                        help='Unix domain socket of the local daemon')
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser(
+        'daemon', help='run the local daemon keeping the session warm')
+    commands.add_parser('orgs', help='list the organizations (via daemon)')
+    networks = commands.add_parser(
+        'networks', help="list an organization's networks (via daemon)")
+    networks.add_argument('org_name')
+    networks.add_argument('--refresh', action='store_true')
+    commands.add_parser('stop', help='stop the local daemon')
+    return parser.parse_args()
 
 
 def main():
     """Main function."""
-    defaultlab.create_lab()
+    args = parse_args()
+    if args.command == 'daemon':
+        from utilities import daemon, utils
+        try:
+            daemon.serve(auth=utils.API_KEY, socket_path=args.socket)
+        except ValueError as err:
+            print(f'-> {err}')
+    elif args.command in ('orgs', 'networks', 'stop'):
+        try:
+            if args.command == 'orgs':
+                print(json.dumps(daemonclient.request(
+                    'organizations', socket_path=args.socket), indent=4))
+            elif args.command == 'networks':
+                print(json.dumps(daemonclient.request(
+                    'networks', socket_path=args.socket,
+                    org_name=args.org_name, refresh=args.refresh), indent=4))
+            else:
+                daemonclient.request('shutdown', socket_path=args.socket)
+        except PermissionError as err:  # Another user's socket
+            print(f'-> {err}')
+        except OSError as err:
+            print(f'-> Daemon Error: The daemon is not reachable - {err}')
+            print('-> Start it with: merakidashboard.py daemon')
+        except ValueError as err:
+            print(f'-> {err}')
+    else:
+        from traininglabs import defaultlab
+        defaultlab.create_lab()
 
 
 if __name__ == '__main__':
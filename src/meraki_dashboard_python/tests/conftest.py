@@ -0,0 +1,14 @@
+#!/usr/bin/env python
+"""Tests configuration.
+
+The modules import each other as top-level packages (e.g. 'from utilities
+import utils'), so the package directory and the benchmarks directory (for
+the stand-in server) are put on the path, wherever pytest is run from.
+"""
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', '..', '..', 'benchmarks'))
+sys.path.insert(0, os.path.join(HERE, '..'))
+os.environ.setdefault('MERAKI_API_KEY_HH', '')  # Required by utils import
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+"""Asyncio utils Module tests, against the local stand-in server."""
+import asyncio
+import contextlib
+import io
+import json
+import time
+import pytest
+import standin
+from utilities import inventory
+from utilities import ratelimit
+
+pytest.importorskip('aiohttp')
+from utilities import aioutils  # noqa: E402
+
+API_KEY = 'k' * 40
+
+
+class Handler(standin._Handler):
+    """The stand-in server, with the network names driving the failures:
+
+    - 'fail-502-*': a non-JSON 502 on the first attempt.
+    - 'fail-429-*': a 429 with Retry-After on the first attempt.
+    - 'reject-*': a 400 with an 'errors' body.
+    - 'empty-*': a 201 without a body.
+    - 'slow-*': answered after a second.
+    """
+
+    def do_GET(self):
+        time.sleep(self.server.get_delay)
+        super().do_GET()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        name = json.loads(body)['name']
+        attempts = self.server.attempts
+        attempts[name] = attempts.get(name, 0) + 1
+        if name.startswith('fail-502') and attempts[name] == 1:
+            return self._raw(502, b'<html>Bad Gateway</html>')
+        if name.startswith('fail-429') and attempts[name] == 1:
+            return self._raw(429, b'', {'Retry-After': '0'})
+        if name.startswith('reject'):
+            return self._send({'errors': ['Name is invalid']}, status=400)
+        if name.startswith('empty'):
+            return self._raw(201, b'')
+        if name.startswith('slow'):
+            time.sleep(1)
+        self.rfile = io.BytesIO(body)
+        super().do_POST()
+
+    def _raw(self, status: int, body: bytes, headers: dict = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = standin.serve(standin.make_inventory(orgs=1, networks=3))
+    server.RequestHandlerClass = Handler
+    server.attempts = dict()
+    server.get_delay = 0
+    yield server
+    server.shutdown()
+
+
+def run(server, workflow):
+    """Run workflow(session, org) in an authenticated session.
+
+    -> Return the workflow's result.
+    """
+    async def main():
+        async with aioutils.dashboard_session(
+                API_KEY, base_url=standin.base_url(server, 'v0')) as session:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return await workflow(session, session['organizations'][0])
+    return asyncio.run(main())
+
+
+def specs(*names) -> list:
+    return [{'name': name, 'type': 'switch'} for name in names]
+
+
+def test_each_network_is_posted_once(server):
+    net_inventory = inventory.NetworkInventory(
+        lambda org_id: list(server.inventory[org_id]['networks']))
+
+    async def workflow(session, org):
+        net_inventory.get_networks(org['id'])
+        return await aioutils.create_networks(
+            session['dashboardAPI'], org, specs('A', 'B', 'C', 'A'),
+            net_inventory=net_inventory,
+            limiter=ratelimit.RateLimiter(rate=1000))
+
+    created = run(server, workflow)
+    assert [net['name'] for net in created] == ['A', 'B', 'C']
+    assert server.attempts == {'A': 1, 'B': 1, 'C': 1}
+    org_id = created[0]['organizationId']
+    assert {'A', 'B', 'C'} <= {
+        net['name'] for net in net_inventory.get_networks(org_id)}
+
+
+def test_errors_are_handled_per_spec(server):
+    net_inventory = inventory.NetworkInventory(
+        lambda org_id: list(server.inventory[org_id]['networks']))
+
+    async def workflow(session, org):
+        net_inventory.get_networks(org['id'])
+        return await aioutils.create_networks(
+            session['dashboardAPI'], org,
+            specs('fail-502-a', 'fail-429-a', 'reject-a', 'empty-a', 'ok-a'),
+            net_inventory=net_inventory,
+            limiter=ratelimit.RateLimiter(rate=1000))
+
+    created = run(server, workflow)
+    assert sorted(net['name'] for net in created) == [
+        'fail-429-a', 'fail-502-a', 'ok-a']
+    assert server.attempts == {'fail-502-a': 2, 'fail-429-a': 2,
+                               'reject-a': 1, 'empty-a': 1, 'ok-a': 1}
+    # Created without a body: the cached networks are re-fetched
+    assert not net_inventory.is_cached(created[0]['organizationId'])
+
+
+def test_cancellation_leaves_no_task_behind(server):
+    async def workflow(session, org):
+        creation = asyncio.ensure_future(aioutils.create_networks(
+            session['dashboardAPI'], org, specs('slow-a', 'slow-b'),
+            limiter=ratelimit.RateLimiter(rate=1000)))
+        await asyncio.sleep(0.3)
+        creation.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await creation
+        return [task for task in asyncio.all_tasks()
+                if task is not asyncio.current_task()]
+
+    assert run(server, workflow) == []
+
+
+def test_sessions_do_not_share_requests(server):
+    base_url = standin.base_url(server, 'v0')
+
+    async def main():
+        first = await aioutils.init_dashboard_session(API_KEY, base_url)
+        second = await aioutils.init_dashboard_session(API_KEY, base_url)
+        org_name = second['organizations'][0]['name']
+        server.get_delay = 0.3
+        with contextlib.redirect_stdout(io.StringIO()):
+            first_call = asyncio.ensure_future(aioutils.get_org_networks(
+                first['dashboardAPI'], org_name))
+            second_call = asyncio.ensure_future(aioutils.get_org_networks(
+                second['dashboardAPI'], org_name))
+            await asyncio.sleep(0.1)
+            first_call.cancel()
+            await first['dashboardAPI']._session.close()
+            try:
+                return await second_call
+            finally:
+                await second['dashboardAPI']._session.close()
+
+    assert len(asyncio.run(main())) == 3
+
+
+def test_unauthorized_key(server):
+    async def main():
+        await aioutils.init_dashboard_session(
+            '', base_url=standin.base_url(server, 'v0'))
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
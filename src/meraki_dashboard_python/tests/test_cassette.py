@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""Cassette Module tests, against the local stand-in server."""
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import requests
+import standin
+from utilities import cassette
+from utilities import utils
+
+
+@pytest.fixture
+def server():
+    server = standin.serve(standin.make_inventory(orgs=2, networks=5))
+    yield server
+    server.shutdown()
+
+
+def test_record_then_replay(server, tmp_path):
+    path = str(tmp_path / 'cassette.jsonl')
+    session = utils.init_dashboard_session(
+        'k' * 40, base_url=standin.base_url(server, 'v0'), record=path)
+    org_id = session['organizations'][0]['id']
+    networks = session['dashboardAPI'].networks.getOrganizationNetworks(
+        org_id)
+    utils.close_session(session['dashboardAPI'])
+    with open(path) as a_file:
+        recorded = a_file.read()
+    assert recorded.count('\n') == 2
+    assert 'k' * 40 not in recorded
+
+    # Another base URL: only the path and the query are matched
+    replayed = utils.init_dashboard_session(
+        'k' * 40, base_url='https://replay.invalid/api/v0', replay=path,
+        replay_speed=0)
+    dashboard = replayed['dashboardAPI']
+    assert replayed['organizations'] == session['organizations']
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(
+            lambda _: dashboard.networks.getOrganizationNetworks(org_id),
+            range(50)))
+    assert all(result == networks for result in results)
+    utils.close_session(dashboard)
+
+
+def test_attach_returns_the_adapter(tmp_path):
+    path = str(tmp_path / 'cassette.jsonl')
+    session = requests.Session()
+    adapter = cassette.attach(session, record=path)
+    assert isinstance(adapter, cassette.RecordingAdapter)
+    session.close()
+    assert adapter._file.closed
+    assert cassette.attach(session) is None
+    with pytest.raises(ValueError):
+        cassette.attach(session, record=path, replay=path)
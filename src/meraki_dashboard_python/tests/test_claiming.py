@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""Device claiming Module tests."""
+import meraki
+from utilities import claiming
+from utilities import inventory
+from utilities import ratelimit
+
+NETWORKS = [
+    {'id': 'NA', 'name': 'Site A', 'productTypes': ['appliance', 'wireless']},
+    {'id': 'NB', 'name': 'Site B', 'productTypes': ['switch']},
+    {'id': 'NC1', 'name': 'Site C', 'productTypes': ['switch']},
+    {'id': 'NC2', 'name': 'Site C', 'productTypes': ['appliance', 'camera']}
+    ]
+
+
+def device(serial: str, model: str, network: str) -> dict:
+    return {'serial': serial, 'model': model, 'network': network}
+
+
+class Response:
+    """A requests.Response stand-in for meraki.APIError."""
+
+    status_code = 400
+    reason = 'Bad Request'
+    text = ''
+
+    @staticmethod
+    def json():
+        return {'errors': ['Invalid serial']}
+
+
+class FakeDashboard:
+    """A DashboardAPI stand-in recording the created networks and claims."""
+
+    def __init__(self, rejected: set = ()):
+        self.networks = self
+        self.devices = self
+        self.created = list()
+        self.claims = list()
+        self._rejected = set(rejected)
+
+    def createOrganizationNetwork(self, organizationId, name, type,
+                                  timeZone):
+        network = {'id': f'N_{name}', 'name': name,
+                   'productTypes': type.split()}
+        self.created.append(network)
+        return network
+
+    def claimNetworkDevices(self, networkId, serials):
+        self.claims.append((networkId, list(serials)))
+        if self._rejected & set(serials):
+            raise meraki.APIError(
+                {'tags': ['Devices'], 'operation': 'claimNetworkDevices'},
+                Response())
+
+
+def test_group_devices():
+    groups, errors = claiming.group_devices([
+        device('Q2AA-0000-0001', 'MX68', 'Site A'),
+        device('Q2AA-0000-0002', 'MR33', 'Site A'),
+        device('Q2AA-0000-0001', 'MX68', 'Site A'),
+        device('BAD', 'MX68', 'Site A'),
+        device('Q2AA-0000-0003', 'Z3', 'Site A'),
+        device('Q2AA-0000-0004', 'MS120-8', 'Site B')])
+    assert groups == {
+        'Site A': {'productTypes': {'appliance', 'wireless'},
+                   'serials': ['Q2AA-0000-0001', 'Q2AA-0000-0002']},
+        'Site B': {'productTypes': {'switch'},
+                   'serials': ['Q2AA-0000-0004']}}
+    assert sorted(errors) == [2, 3, 4]
+    assert '(row 0)' in errors[2]
+
+
+def test_resolve_networks_across_network_kinds():
+    groups = {
+        'Site A': {'productTypes': {'wireless'}},   # Combined one has it
+        'Site B': {'productTypes': {'wireless'}},   # Exists without it
+        'Site C': {'productTypes': {'camera'}},     # Either kind
+        'Site D': {'productTypes': {'switch'}}}     # New
+    existing, to_create, errors = claiming.resolve_networks(NETWORKS, groups)
+    assert existing == {'Site A': 'NA', 'Site C': 'NC2'}
+    assert to_create == ['Site D']
+    assert list(errors) == ['Site B'] and "['wireless']" in errors['Site B']
+
+
+def test_claim_results_per_row():
+    dashboard = FakeDashboard(rejected={'Q2AA-0000-0003'})
+    net_inventory = inventory.NetworkInventory(lambda org_id: NETWORKS)
+    devices = [
+        device('Q2AA-0000-0001', 'MR33', 'Site A'),
+        device('Q2AA-0000-0002', 'MR33', 'Site A'),
+        device('Q2AA-0000-0003', 'MR33', 'Site A'),
+        device('Q2AA-0000-0001', 'MR33', 'Site A'),
+        device('Q2AA-0000-0004', 'MS120-8', 'Site D'),
+        device('Q2AA-0000-0005', 'MR33', 'Site B')]
+    results = claiming.claim_devices(
+        dashboard, {'id': '1', 'name': 'Org'}, devices, net_inventory,
+        limiter=ratelimit.RateLimiter(rate=1000), batch_size=2)
+
+    assert [r['serial'] for r in results] == [d['serial'] for d in devices]
+    assert [r['networkId'] for r in results] == [
+        'NA', 'NA', 'NA', None, 'N_Site D', None]
+    assert [r['error'] is None for r in results] == [
+        True, True, False, False, True, False]
+    assert 'Invalid serial' in results[2]['error']
+    assert 'Duplicate serial' in results[3]['error']
+    assert 'no product types' in results[5]['error']
+    assert [net['name'] for net in dashboard.created] == ['Site D']
+    # The rejected batch is retried serial by serial
+    assert ('NA', ['Q2AA-0000-0003']) in dashboard.claims
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""Daemon Module tests, against the local stand-in server."""
+import os
+import stat
+import threading
+import pytest
+import standin
+from utilities import daemon
+from utilities import daemonclient
+
+
+@pytest.fixture
+def server():
+    server = standin.serve(standin.make_inventory(orgs=2, networks=5))
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / 'run' / 'daemon.sock')
+
+
+def start_daemon(server, socket_path) -> daemon.DashboardDaemon:
+    """Start a daemon serving on a background thread."""
+    dashboard_daemon = daemon.DashboardDaemon(
+        'k' * 40, socket_path=socket_path,
+        base_url=standin.base_url(server, 'v0'))
+    threading.Thread(
+        target=dashboard_daemon.serve_forever, daemon=True).start()
+    return dashboard_daemon
+
+
+def test_serves_and_stops(server, socket_path):
+    dashboard_daemon = start_daemon(server, socket_path)
+    assert stat.S_IMODE(os.stat(os.path.dirname(socket_path)).st_mode) \
+        == 0o700
+    orgs = daemonclient.request('organizations', socket_path=socket_path)
+    assert len(orgs) == 2
+    networks = daemonclient.request(
+        'networks', socket_path=socket_path, org_name=orgs[0]['name'])
+    assert len(networks) == 5
+    with pytest.raises(ValueError):
+        daemonclient.request(
+            'networks', socket_path=socket_path, org_name='Unknown')
+    daemonclient.request('shutdown', socket_path=socket_path)
+    dashboard_daemon.server_close()
+    assert not daemonclient.is_running(socket_path)
+
+
+def test_running_daemon_is_not_replaced(server, socket_path):
+    dashboard_daemon = start_daemon(server, socket_path)
+    try:
+        with pytest.raises(ValueError):
+            daemon.DashboardDaemon(
+                'k' * 40, socket_path=socket_path,
+                base_url=standin.base_url(server, 'v0'))
+        assert daemonclient.is_running(socket_path)
+    finally:
+        dashboard_daemon.shutdown()
+        dashboard_daemon.server_close()
+
+
+def test_stale_socket_is_replaced(server, socket_path):
+    os.makedirs(os.path.dirname(socket_path), mode=0o700)
+    open(socket_path, 'w').close()
+    dashboard_daemon = start_daemon(server, socket_path)
+    try:
+        assert daemonclient.is_running(socket_path)
+    finally:
+        dashboard_daemon.shutdown()
+        dashboard_daemon.server_close()
+
+
+def test_other_users_socket_is_refused(server, socket_path, monkeypatch):
+    os.makedirs(os.path.dirname(socket_path), mode=0o700)
+    open(socket_path, 'w').close()
+    monkeypatch.setattr(os, 'getuid', lambda: os.lstat(socket_path).st_uid
+                        + 1)
+    with pytest.raises(PermissionError):
+        daemonclient.request('ping', socket_path=socket_path)
+    with pytest.raises(ValueError):
+        daemon.DashboardDaemon(
+            'k' * 40, socket_path=socket_path,
+            base_url=standin.base_url(server, 'v0'))
+    assert os.path.exists(socket_path)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Drift scanner Module tests."""
+import json
+from utilities import drift
+from utilities import ratelimit
+
+NETWORKS = [
+    {'id': 'N1', 'name': 'Site 1', 'type': 'wireless', 'tags': '',
+     'timeZone': 'Australia/NSW'},
+    {'id': 'N2', 'name': 'Site 2', 'type': 'wireless', 'tags': '',
+     'timeZone': 'Australia/NSW'}
+    ]
+
+
+class Fetcher:
+    """A section fetcher recording its calls, failing for some networks."""
+
+    def __init__(self):
+        self.calls = list()
+        self.fail = dict()  # network ID -> exception
+
+    def __call__(self, net):
+        self.calls.append(net['id'])
+        if net['id'] in self.fail:
+            raise self.fail[net['id']]
+        return {'enabled': True}
+
+
+def make_scanner(fetcher, state_file=None) -> drift.DriftScanner:
+    return drift.DriftScanner(
+        fetchers={'section': fetcher}, state_file=state_file,
+        limiter=ratelimit.RateLimiter(rate=1000))
+
+
+def test_unchanged_networks_are_not_refetched():
+    fetcher = Fetcher()
+    scanner = make_scanner(fetcher)
+    scanner.scan('1', NETWORKS)
+    fetcher.calls.clear()
+    scanner.scan('1', NETWORKS)
+    assert fetcher.calls == []
+    scanner.mark_changed('N2')
+    scanner.scan('1', NETWORKS)
+    assert fetcher.calls == ['N2']
+
+
+def test_unexpected_error_is_reported_and_state_saved(tmp_path):
+    state_file = str(tmp_path / 'drift.json')
+    fetcher = Fetcher()
+    fetcher.fail['N1'] = RuntimeError('boom')
+    report = make_scanner(fetcher, state_file).scan('1', NETWORKS)
+    assert report['errors'] == [{'networkId': 'N1', 'section': 'section',
+                                 'error': 'RuntimeError: boom'}]
+    assert report['fetched'] == {'section': 1}
+    with open(state_file) as a_file:
+        assert 'section' in json.load(a_file)['N2']
+
+
+def test_failed_network_is_refetched_next_scan():
+    fetcher = Fetcher()
+    scanner = make_scanner(fetcher)
+    scanner.scan('1', NETWORKS)
+    scanner.mark_changed('N1')
+    fetcher.fail['N1'] = RuntimeError('boom')
+    scanner.scan('1', NETWORKS)
+    del fetcher.fail['N1']
+    fetcher.calls.clear()
+    scanner.scan('1', NETWORKS)
+    assert fetcher.calls == ['N1']
+    fetcher.calls.clear()
+    scanner.scan('1', NETWORKS)
+    assert fetcher.calls == []
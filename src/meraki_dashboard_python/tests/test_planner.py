@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Dry-run planner Module tests."""
+import pytest
+from utilities import inventory
+from utilities import planner
+
+ORGS = [{'id': '1', 'name': 'Org', 'url': 'u'}]
+NETWORKS = [
+    {'id': 'N1', 'name': 'Site 1', 'productTypes': ['appliance', 'switch']},
+    {'id': 'N2', 'name': 'Site 1', 'productTypes': ['switch']},
+    {'id': 'N3', 'name': 'Site 2', 'productTypes': ['wireless']}
+    ]
+
+
+def make_inventory(fetches: list) -> inventory.NetworkInventory:
+    def fetch(org_id):
+        fetches.append(org_id)
+        return list(NETWORKS)
+    return inventory.NetworkInventory(fetch)
+
+
+def row(action: str, name: str, **fields) -> dict:
+    return {'organization': 'Org', 'action': action, 'name': name, **fields}
+
+
+def test_networks_are_read_once():
+    fetches = list()
+    net_inventory = make_inventory(fetches)
+    job = [row('delete', 'Site 2'), row('create', 'Site 3', type='switch')]
+    plan = planner.plan_job(ORGS, job, net_inventory)
+    assert fetches == ['1']
+    assert plan['organizations']['1']['reads'] == 1
+    assert (plan['reads'], plan['writes']) == (1, 2)
+    plan = planner.plan_job(ORGS, job, net_inventory)
+    assert plan['reads'] == 0 and fetches == ['1']
+
+
+def test_create_conflicts_are_skipped():
+    job = [row('create', 'Site 2', type='wireless'),
+           row('create', 'Site 2', type='appliance wireless'),
+           row('create', 'Site 4', type='switch'),
+           row('create', 'Site 4', type='switch')]
+    plan = planner.plan_job(ORGS, job, make_inventory([]))
+    org_plan = plan['organizations']['1']
+    assert org_plan['creates'] == 2
+    assert [(s['row'], s['reason']) for s in org_plan['skipped']] == [
+        (0, 'exists'), (3, 'duplicate')]
+
+
+@pytest.mark.parametrize('name, fields, deletes, reason', [
+    ('Site 1', {}, 0, 'ambiguous'),
+    ('Site 1', {'type': 'appliance switch'}, 1, None),
+    ('Site 1', {'type': 'switch'}, 1, None),
+    ('Site 2', {}, 1, None),
+    ('Site 2', {'type': 'appliance wireless'}, 0, 'missing'),
+    ('Site 9', {}, 0, 'missing'),
+    ])
+def test_delete_rows_resolve_one_network(name, fields, deletes, reason):
+    plan = planner.plan_job(
+        ORGS, [row('delete', name, **fields)], make_inventory([]))
+    org_plan = plan['organizations']['1']
+    assert org_plan['deletes'] == deletes
+    assert [s['reason'] for s in org_plan['skipped']] == (
+        [reason] if reason else [])
+
+
+def test_unknown_org_is_an_error():
+    plan = planner.plan_job(
+        ORGS, [{'organization': 'Other', 'action': 'delete',
+                'name': 'Site 1'}], make_inventory([]))
+    assert len(plan['errors']) == 1 and plan['writes'] == 0
+
+
+def test_estimate_follows_concurrency():
+    org_calls = {'1': 20}
+    assert planner.simulate(org_calls, concurrency=1) == pytest.approx(6.0)
+    assert planner.simulate(org_calls, concurrency=8) < 6.0
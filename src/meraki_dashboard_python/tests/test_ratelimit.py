@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+"""Rate limit Module tests."""
+import pytest
+from utilities import ratelimit
+
+
+@pytest.fixture(params=['RateLimiter', 'SharedRateLimiter'])
+def make_limiter(request):
+    """Build either rate limiter for the keys 'A' and 'B'."""
+    def make(**options):
+        if request.param == 'SharedRateLimiter':
+            return ratelimit.SharedRateLimiter(['A', 'B'], **options)
+        return ratelimit.RateLimiter(**options)
+    return make
+
+
+def test_keys_are_independent(make_limiter):
+    limiter = make_limiter(rate=5)
+    for _ in range(10):
+        limiter.reserve('A')
+    assert limiter.reserve('B') <= 0.01
+
+
+def test_key_slots_are_spaced(make_limiter):
+    limiter = make_limiter(rate=5)
+    delays = [limiter.reserve('A') for _ in range(3)]
+    assert delays[1] == pytest.approx(0.2, abs=0.05)
+    assert delays[2] == pytest.approx(0.4, abs=0.05)
+
+
+def test_global_rate_spans_keys(make_limiter):
+    limiter = make_limiter(rate=5, global_rate=2)
+    limiter.reserve('A')
+    assert limiter.reserve('B') == pytest.approx(0.5, abs=0.05)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""Network tags Module tests."""
+import pytest
+from utilities import ratelimit
+from utilities import tags
+
+NETWORKS = [
+    {'id': 'N1', 'tags': ' prod site1 '},
+    {'id': 'N2', 'tags': ['lab', 'site2']},
+    {'id': 'N3', 'tags': None}
+    ]
+
+
+class FakeDashboard:
+    """A DashboardAPI stand-in recording the network updates."""
+
+    def __init__(self, fail: dict = None):
+        self.networks = self
+        self.updates = dict()
+        self._fail = fail or dict()
+
+    def updateNetwork(self, networkId, tags):
+        if networkId in self._fail:
+            raise self._fail[networkId]
+        self.updates[networkId] = tags
+
+
+def test_query():
+    index = tags.TagIndex(NETWORKS)
+    assert index.query(any_of=['prod', 'lab']) == {'N1', 'N2'}
+    assert index.query(none_of=['prod']) == {'N2', 'N3'}
+    assert index.query(all_of=['lab', 'site2']) == {'N2'}
+
+
+def test_plan_only_changed_networks():
+    changes = tags.plan_tag_changes(NETWORKS, add=['prod'], remove=['lab'])
+    assert [change['networkId'] for change in changes] == ['N2', 'N3']
+    assert changes[0]['tags'] == ['site2', 'prod']
+
+
+@pytest.mark.parametrize('tag', ['bad/tag', 'two tags', ''])
+def test_invalid_tag_is_rejected_up_front(tag):
+    with pytest.raises(ValueError):
+        tags.plan_tag_changes(NETWORKS, add=[tag])
+    dashboard = FakeDashboard()
+    with pytest.raises(ValueError):
+        tags.apply_tag_changes(dashboard, '1', [
+            {'networkId': 'N1', 'tags': [tag], 'added': [tag],
+             'removed': []}])
+    assert dashboard.updates == {}
+
+
+def test_unexpected_error_is_reported_per_network():
+    dashboard = FakeDashboard(fail={'N2': RuntimeError('boom')})
+    changes = tags.plan_tag_changes(NETWORKS, add=['new'])
+    results = tags.apply_tag_changes(
+        dashboard, '1', changes, ratelimit.RateLimiter(rate=1000))
+    assert [r['networkId'] for r in results] == ['N1', 'N2', 'N3']
+    assert results[1]['error'] == 'RuntimeError: boom'
+    assert results[0]['error'] is None and results[2]['error'] is None
+    assert dashboard.updates['N1'] == 'prod site1 new'
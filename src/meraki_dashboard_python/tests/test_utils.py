@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Utils Module tests (in-flight request coalescing)."""
+import threading
+import time
+import pytest
+from utilities import utils
+
+
+class FakeDashboard:
+    """A DashboardAPI stand-in whose getOrganizations blocks until released.
+
+    - base_url (string): the session's API base URL.
+    - error (Exception): raised by getOrganizations, if provided.
+    """
+
+    def __init__(self, base_url: str = utils.BASE_URL, error=None):
+        self._session = type('Session', (), {
+            '_api_key': 'k' * 40, '_base_url': base_url})()
+        self.organizations = self
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self._error = error
+
+    def getOrganizations(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if self._error is not None:
+            raise self._error
+        return [{'id': '1', 'name': 'Org', 'url': 'u'}]
+
+
+def run_callers(dashboards: list) -> list:
+    """Call dedup_get concurrently, once per dashboard, the first one leading.
+
+    -> Return the list of (result, error) in the dashboards order.
+    """
+    outcomes = [None] * len(dashboards)
+
+    def call(i):
+        try:
+            outcomes[i] = (utils.dedup_get(
+                dashboards[i], 'organizations.getOrganizations'), None)
+        except Exception as err:
+            outcomes[i] = (None, err)
+
+    threads = [threading.Thread(target=call, args=(i,))
+               for i in range(len(dashboards))]
+    threads[0].start()
+    dashboards[0].started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)  # Let the other callers reach the in-flight call
+    for dashboard in dashboards:
+        dashboard.release.set()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    utils.SINGLE_FLIGHT.reset_stats()
+
+
+def test_concurrent_callers_coalesce():
+    dashboard = FakeDashboard()
+    outcomes = run_callers([dashboard] * 5)
+    assert dashboard.calls == 1
+    assert all(result == outcomes[0][0] for result, _ in outcomes)
+    stats = utils.get_dedup_stats()
+    assert (stats['calls'], stats['hits']) == (1, 4)
+    assert stats['endpoints']['getOrganizations'] == {'calls': 1, 'hits': 4}
+
+
+def test_error_reaches_every_waiter():
+    dashboard = FakeDashboard(error=RuntimeError('boom'))
+    outcomes = run_callers([dashboard] * 3)
+    assert dashboard.calls == 1
+    assert all(isinstance(error, RuntimeError) for _, error in outcomes)
+
+
+def test_key_is_released_after_the_call():
+    dashboard = FakeDashboard()
+    dashboard.release.set()
+    utils.dedup_get(dashboard, 'organizations.getOrganizations')
+    utils.dedup_get(dashboard, 'organizations.getOrganizations')
+    assert dashboard.calls == 2
+    assert utils.get_dedup_stats()['hits'] == 0
+
+
+def test_base_urls_are_not_shared():
+    live = FakeDashboard()
+    standin = FakeDashboard(base_url='http://127.0.0.1:8080/api/v0')
+    run_callers([live, standin])
+    assert (live.calls, standin.calls) == (1, 1)
+    assert utils.get_dedup_stats()['hits'] == 0
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Webhook receiver Module tests, posting synthetic events locally."""
+import asyncio
+from utilities import inventory
+from utilities import webhooks
+
+SECRET = 'shared-secret'
+NETWORKS = {
+    '1': [{'id': 'N1', 'name': 'Site 1', 'productTypes': ['switch']}],
+    '2': [{'id': 'N2', 'name': 'Site 2', 'productTypes': ['switch']}]
+    }
+
+
+def make_inventory() -> inventory.NetworkInventory:
+    """Build an inventory with both organizations cached."""
+    net_inventory = inventory.NetworkInventory(
+        lambda org_id: list(NETWORKS[org_id]))
+    for org_id in NETWORKS:
+        net_inventory.get_networks(org_id)
+    return net_inventory
+
+
+def post(receiver: webhooks.WebhookReceiver, *events) -> list:
+    """Start the receiver, post the events and stop it.
+
+    -> Return the HTTP status codes of the responses.
+    """
+    async def run():
+        port = await receiver.start()
+        url = f'http://127.0.0.1:{port}/'
+        loop = asyncio.get_running_loop()
+        try:
+            return [
+                await loop.run_in_executor(
+                    None, webhooks.post_event, url, event)
+                for event in events]
+        finally:
+            await receiver.stop()
+    return asyncio.run(run())
+
+
+def test_bad_secret_is_rejected():
+    net_inventory = make_inventory()
+    receiver = webhooks.WebhookReceiver(SECRET, net_inventory)
+    assert post(receiver, webhooks.make_event(
+        'wrong', organizationId='1')) == [401]
+    assert net_inventory.is_cached('1')
+    assert receiver.stats['rejected'] == 1
+
+
+def test_settings_changed_invalidates_org():
+    net_inventory = make_inventory()
+    receiver = webhooks.WebhookReceiver(SECRET, net_inventory)
+    assert post(receiver, webhooks.make_event(
+        SECRET, organizationId='1', networkId='N1')) == [200]
+    assert not net_inventory.is_cached('1')
+    assert net_inventory.is_cached('2')
+
+
+def test_unknown_network_invalidates_org():
+    net_inventory = make_inventory()
+    receiver = webhooks.WebhookReceiver(SECRET, net_inventory)
+    statuses = post(
+        receiver,
+        webhooks.make_event(SECRET, 'usage_alert', organizationId='1',
+                            networkId='N1'),
+        webhooks.make_event(SECRET, 'usage_alert', organizationId='2',
+                            networkId='N_NEW'))
+    assert statuses == [200, 200]
+    assert net_inventory.is_cached('1')
+    assert not net_inventory.is_cached('2')
+
+
+def test_event_without_org_keeps_the_cache():
+    net_inventory = make_inventory()
+    receiver = webhooks.WebhookReceiver(SECRET, net_inventory)
+    assert post(receiver, webhooks.make_event(SECRET)) == [200]
+    assert all(net_inventory.is_cached(org_id) for org_id in NETWORKS)
+
+
+def test_failing_listener_answers_500():
+    receiver = webhooks.WebhookReceiver(SECRET, make_inventory())
+    seen = list()
+
+    def fail(event):
+        raise ValueError('boom')
+
+    receiver.add_listener(fail)
+    receiver.add_listener(seen.append)
+    assert post(receiver, webhooks.make_event(
+        SECRET, organizationId='1')) == [500]
+    assert len(seen) == 1
+    assert receiver.stats['errors'] == 1
+
+
+def test_malformed_body_answers_400():
+    receiver = webhooks.WebhookReceiver(SECRET)
+    assert post(receiver, ['not', 'an', 'object']) == [400]
@@ -3,6 +3,9 @@
 import json
 import meraki
 from utilities import utils
+from utilities import prefetch
+from utilities import inventory
+from utilities import planner
 from utilities import userinputcli as uicli  # Userinput CLI module
 
 
@@ -22,9 +25,26 @@ def create_network():
     dashboard = dashboard_session['dashboardAPI']  # Persistent dashboard API
     orgs = dashboard_session['organizations']  # List of organizations
     org = uicli.input_get_org(orgs)  # Get a specific organization
-    net_name = uicli.input_net_name()  # Network name
-    net_tags = uicli.input_tags(tag_type='network')  # Network tags
-    net_type = ' '.join(uicli.input_net_type())  # Nework type
+    with prefetch.Prefetcher() as prefetcher:
+        # Fetch the org's networks while the user is still being prompted
+        prefetcher.submit(
+            'networks', utils.dedup_get, dashboard,
+            'networks.getOrganizationNetworks', org['id'])
+        net_name = uicli.input_net_name()  # Network name
+        net_tags = uicli.input_tags(tag_type='network')  # Network tags
+        net_type = ' '.join(uicli.input_net_type())  # Nework type
+        try:
+            org_networks = prefetcher.result('networks')
+        except meraki.APIError:
+            org_networks = list()  # Let the API validate the network name
+
+    # Network name is only unique within a combined or standalone network
+    if utils.get_networks(
+            org_networks, net_name, net_type=2 if ' ' in net_type else 1):
+        print(
+            f"-> Data Error: The network named '{net_name}' already exists "
+            f"in the organization '{org['name']}'!")
+        return
 
     # Create a new Meraki network
     print(f"Creating a new Meraki network: '{net_name}'...\n")
@@ -46,6 +66,78 @@ def create_network():
         print(json.dumps(new_network, indent=4))
 
 
+def create_networks(dashboard: meraki.DashboardAPI, org: dict,
+                    net_specs: list,
+                    net_inventory: inventory.NetworkInventory = None,
+                    dry_run: bool = False) -> list:
+    """Create new networks in bulk.
+    ** Note: the network names are checked against a single fetched or cached
+    networks list before any network is created, so a conflicting name
+    doesn't use up a rate-limited write.
+
+    - dashboard (meraki.DashboardAPI object): authenticated DashboardAPI
+      session.
+    - org (dict): a unique organization, see utils.filter_orgs()
+    - net_specs (list): the networks to be created, each a dict() with the
+      'name', 'type' (network types separated by space) and optional 'tags'.
+    - net_inventory (inventory.NetworkInventory object): networks cache.
+    - dry_run (bool): only print the planned API calls and the estimated
+      wall time (see the planner module), without sending any write.
+    -> Return a list of the created networks.
+    """
+    if dry_run:
+        if net_inventory is None:
+            net_inventory = inventory.NetworkInventory(
+                lambda org_id: utils.dedup_get(
+                    dashboard, 'networks.getOrganizationNetworks', org_id))
+        plan = planner.plan_job(
+            [org], [{'organization': org['name'], 'action': 'create', **spec}
+                    for spec in net_specs], net_inventory)
+        # The networks are created one at a time
+        print(planner.format_plan(plan, concurrency=1))
+        return list()
+
+    if net_inventory is None:
+        org_networks = utils.dedup_get(
+            dashboard, 'networks.getOrganizationNetworks', org['id'])
+    else:
+        org_networks = net_inventory.get_networks(org['id'])
+
+    conflicts = utils.check_name_conflicts(org_networks, net_specs)
+    for conflict in conflicts:
+        if 'network' in conflict:
+            print(
+                f"-> Data Error: The network named '{conflict['name']}' "
+                f"already exists in the organization '{org['name']}'!")
+        else:
+            print(
+                f"-> Data Error: The network named '{conflict['name']}' is "
+                f"requested more than once (row {conflict['duplicateOf']}).")
+    skipped = {conflict['index'] for conflict in conflicts}
+
+    new_networks = list()
+    for i, spec in enumerate(net_specs):
+        if i in skipped:
+            continue
+        print(f"Creating a new Meraki network: '{spec['name']}'...")
+        try:
+            new_network = dashboard.networks.createOrganizationNetwork(
+                organizationId=org['id'],
+                name=spec['name'],
+                type=spec['type'],
+                tags=spec.get('tags', ''),
+                timeZone=utils.DEFAULT_TIME_ZONE)
+        except meraki.APIError as err:
+            print(
+                f'-> Meraki API error: '
+                f"{err.message['errors'][0]}")
+        else:
+            new_networks.append(new_network)
+            if net_inventory is not None:
+                net_inventory.upsert_network(org['id'], new_network)
+    return new_networks
+
+
 def create_lab():
     """Default lab"""
     create_network()
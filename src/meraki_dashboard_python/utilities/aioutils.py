@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+"""Asyncio utils Module.
+
+This module is the asyncio counterpart of the utils module, built on the
+Meraki SDK's meraki.aio client, so an asyncio service can run many dashboard
+operations concurrently on one event loop instead of pushing the synchronous
+calls into a thread executor.
+
+- The validation and the error semantics are the ones of the utils module.
+- Identical in-flight GET requests are coalesced, like utils.dedup_get().
+- The aiohttp session is always closed, even if the caller is cancelled.
+"""
+import asyncio
+import contextlib
+import json
+import meraki
+from utilities import inventory
+from utilities import ratelimit
+from utilities import singleflight
+from utilities import utils
+
+_IN_FLIGHT = dict()  # Request key -> shared asyncio.Task
+
+
+def _aio():
+    """Import meraki.aio, which requires the aiohttp package."""
+    try:
+        import meraki.aio  # pylint: disable=import-outside-toplevel
+    except ImportError as err:
+        raise ImportError(
+            'The asyncio utils require the aiohttp package: '
+            'pip install aiohttp') from err
+    return meraki.aio
+
+
+async def dedup_get(dashboard, endpoint: str, *args, **kwargs):
+    """Send a GET request, coalescing identical in-flight requests.
+    ** Note: a cancelled caller doesn't cancel the request shared with the
+    other callers. Only the callers of the same session share a request, so
+    closing a session never fails another session's callers.
+
+    - dashboard (meraki.aio.AsyncDashboardAPI object): AsyncDashboardAPI
+      session.
+    - endpoint (string): '<section>.<operation>' of the AsyncDashboardAPI
+      object, e.g. 'organizations.getOrganizations'
+    - args, kwargs: the operation's parameters.
+    -> Return the response of the GET request.
+    """
+    section, operation = endpoint.split('.')
+    func = getattr(getattr(dashboard, section), operation)
+    session = getattr(dashboard, '_session', None)
+    auth = getattr(session, '_api_key', None)
+    key = singleflight.request_key(
+        endpoint=operation, params=[args, kwargs],
+        auth=auth if auth is not None else id(dashboard),
+        base_url=getattr(session, '_base_url', None))
+    key += (id(dashboard), id(asyncio.get_running_loop()))
+    task = _IN_FLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(func(*args, **kwargs))
+        _IN_FLIGHT[key] = task
+        task.add_done_callback(lambda _: _IN_FLIGHT.pop(key, None))
+    return await asyncio.shield(task)
+
+
+async def _post(dashboard, url: str, payload: dict):
+    """Send a POST request through the session's aiohttp client.
+    ** Note: meraki.aio only accepts the 200 status, so it re-sends a POST
+    answered with 201 Created up to maximum_retries times (duplicating the
+    created network). The POST is only re-sent if it's rate limited (429) or
+    on a server error (5XX), like the SDK; a connection error or a timeout
+    isn't retried since the request may have been processed.
+
+    - dashboard (meraki.aio.AsyncDashboardAPI object): AsyncDashboardAPI
+      session.
+    - url (string): endpoint URL relative to the base URL.
+    - payload (dict): JSON body.
+    -> Return the JSON response.
+    -> Raise ValueError with the error message if the request has failed.
+    """
+    import aiohttp  # pylint: disable=import-outside-toplevel
+    session = dashboard._session
+    options = {'timeout': aiohttp.ClientTimeout(
+        total=session._single_request_timeout)}
+    if session._certificate_path:
+        options['ssl'] = session._sslcontext
+    for _ in range(session._maximum_retries):
+        try:
+            async with session._req_session.post(
+                    session._base_url + url, json=payload,
+                    **options) as response:
+                status, reason = response.status, response.reason
+                text = await response.text()
+                retry_after = response.headers.get('Retry-After')
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            raise ValueError(f'{type(err).__name__} {err}'.strip()) from err
+        try:
+            body = json.loads(text) if text else None
+        except ValueError:
+            body = None
+        if status < 400:
+            return body
+        if status == 429 and session._wait_on_rate_limit:
+            await asyncio.sleep(float(retry_after or 1))
+        elif status >= 500:
+            await asyncio.sleep(1)
+        else:
+            break
+    errors = body.get('errors') if isinstance(body, dict) else None
+    if errors:
+        raise ValueError(errors[0])
+    raise ValueError(f'{status} {reason} {text[:100]}'.strip())
+
+
+async def init_dashboard_session(auth, base_url: str = utils.BASE_URL,
+                                 **options) -> dict:
+    """Get the authenticated AsyncDashboardAPI session.
+    ** Note: the caller owns the session and needs to close it, see
+    dashboard_session().
+
+    - auth: authentication value
+    - base_url (string): API base URL.
+    - options: any other meraki.aio.AsyncDashboardAPI options.
+    -> Return a dict() including the authenticated
+       meraki.aio.AsyncDashboardAPI object ('dashboardAPI') and the
+       authorized organizations list ('organizations') if authenticated.
+    -> Raise ValueError if the API key is not authorised.
+    """
+    aio = _aio()
+    try:
+        dashboard = aio.AsyncDashboardAPI(
+            api_key=auth, base_url=base_url, output_log=False,
+            print_console=False, **options)
+    except meraki.APIKeyError:
+        dashboard = None
+    else:
+        try:
+            orgs = await dedup_get(
+                dashboard, 'organizations.getOrganizations')
+        except meraki.AsyncAPIError:
+            pass
+        except BaseException:  # Cancelled or failed, don't leak the session
+            await asyncio.shield(dashboard._session.close())
+            raise
+        else:
+            return {'dashboardAPI': dashboard, 'organizations': orgs}
+        await dashboard._session.close()
+    raise ValueError(
+        'Authentication Error: API key is not authorized!')
+
+
+@contextlib.asynccontextmanager
+async def dashboard_session(auth, base_url: str = utils.BASE_URL,
+                            **options):
+    """Share an authenticated AsyncDashboardAPI session in an async with
+    block, closing it on exit even if the block is cancelled.
+
+    - auth, base_url, options: see init_dashboard_session()
+    -> Yield the dict() of init_dashboard_session()
+    """
+    session = await init_dashboard_session(auth, base_url, **options)
+    try:
+        yield session
+    finally:
+        await asyncio.shield(session['dashboardAPI']._session.close())
+
+
+async def get_org_networks(dashboard, org_name: str) -> list:
+    """Get organization's networks filtered by an organization name.
+    ** Note: organization name needs to be unique.
+
+    - dashboard (meraki.aio.AsyncDashboardAPI object): authenticated
+      AsyncDashboardAPI session.
+    - org_name (string): organization name
+    -> Return a list of networks belonging to a provided unique org_name.
+    """
+    try:
+        orgs = await dedup_get(dashboard, 'organizations.getOrganizations')
+    except meraki.AsyncAPIError as err:
+        print(f'-> {err}')
+    else:
+        try:
+            # Get a unique organiation
+            org = utils.filter_orgs(
+                orgs=orgs, org_name=org_name, unique_org=True)
+        except UserWarning as warn:
+            print(f'-> {warn}')
+        except ValueError as err:
+            print(f'-> {err}')
+        else:
+            return await dedup_get(
+                dashboard, 'networks.getOrganizationNetworks', org['id'])
+
+
+async def create_networks(dashboard, org: dict, net_specs: list,
+                          net_inventory: inventory.NetworkInventory = None,
+                          limiter: ratelimit.RateLimiter = None,
+                          max_concurrency: int = 8) -> list:
+    """Create new networks in bulk, see defaultlab.create_networks().
+    ** Note: at most max_concurrency creations are in flight, and each one
+    waits for its organization's rate limit slot without blocking the event
+    loop.
+
+    - dashboard (meraki.aio.AsyncDashboardAPI object): authenticated
+      AsyncDashboardAPI session.
+    - org (dict): a unique organization, see utils.filter_orgs()
+    - net_specs (list): the networks to be created, each a dict() with the
+      'name', 'type' (network types separated by space) and optional 'tags'.
+    - net_inventory (inventory.NetworkInventory object): networks cache.
+    - limiter (ratelimit.RateLimiter object): shared rate limiter.
+    - max_concurrency (integer): maximum number of in-flight creations.
+    -> Return a list of the created networks, in the net_specs order.
+    """
+    limiter = limiter or ratelimit.RateLimiter()
+    if net_inventory is not None and net_inventory.is_cached(org['id']):
+        org_networks = net_inventory.get_networks(org['id'])
+    else:
+        org_networks = await dedup_get(
+            dashboard, 'networks.getOrganizationNetworks', org['id'])
+
+    conflicts = utils.check_name_conflicts(org_networks, net_specs)
+    for conflict in conflicts:
+        if 'network' in conflict:
+            print(
+                f"-> Data Error: The network named '{conflict['name']}' "
+                f"already exists in the organization '{org['name']}'!")
+        else:
+            print(
+                f"-> Data Error: The network named '{conflict['name']}' is "
+                f"requested more than once (row {conflict['duplicateOf']}).")
+    skipped = {conflict['index'] for conflict in conflicts}
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def create(spec):
+        async with semaphore:
+            await asyncio.sleep(limiter.reserve(org['id']))
+            print(f"Creating a new Meraki network: '{spec['name']}'...")
+            try:
+                new_network = await _post(
+                    dashboard, f"/organizations/{org['id']}/networks",
+                    {'name': spec['name'], 'type': spec['type'],
+                     'tags': spec.get('tags', ''),
+                     'timeZone': utils.DEFAULT_TIME_ZONE})
+            except ValueError as err:
+                print(f'-> Meraki API error: {err}')
+                return None
+        if net_inventory is not None:
+            if isinstance(new_network, dict):
+                net_inventory.upsert_network(org['id'], new_network)
+            else:  # Created without a body, re-fetch the networks
+                net_inventory.invalidate(org['id'])
+        return new_network
+
+    tasks = [asyncio.ensure_future(create(spec))
+             for i, spec in enumerate(net_specs) if i not in skipped]
+    try:
+        new_networks = await asyncio.gather(*tasks)
+    except BaseException:  # Cancelled or failed, don't leave tasks behind
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return [network for network in new_networks if network is not None]
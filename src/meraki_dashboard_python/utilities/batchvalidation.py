@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+"""Batch validation Module.
+
+This module validates the bulk network specs column by column, e.g. 100k
+rows of network names, tags, device codes, network types and time zones.
+It applies the same rules and the same error messages as the validate_*
+functions of the utils module, but:
+
+- the rules are compiled once (see the utils module constants),
+- each column is validated in a single pass: the invalid characters rules
+  scan the joined column with one search, and the other rules check each
+  distinct value once,
+- every error of every row is returned instead of raising the first one,
+- the device codes, network types and time zones are resolved with O(1)
+  lookup tables.
+"""
+import bisect
+import itertools
+from utilities import utils
+from utilities import timezones
+
+SEPARATOR = '\x00'  # Joins a column's values, not matched by the rules
+# O(1) lookup tables
+DEVICE_CODE_TABLE = utils.PRODUCT_TYPES  # Lower case device code -> type
+TIME_ZONES = frozenset(timezones.TZ_LIST)
+TIME_ZONE_ERROR = (
+    "Data Error: Invalid time zone! Refer to 'TZ' column in the table in "
+    'en.wikipedia.org')
+
+
+def _invalid_rows(pattern, values: list) -> list:
+    """Get the indexes of the rows matching an invalid characters pattern.
+    ** Note: the column is scanned with a single search over the joined
+    values; the row offsets are only computed if there is a match.
+    """
+    text = SEPARATOR.join(values)
+    match = pattern.search(text)
+    if match is None:
+        return list()
+    starts = list(itertools.accumulate(
+        (len(value) + 1 for value in values), initial=0))
+    rows = list()
+    while match is not None:
+        row = bisect.bisect_right(starts, match.start()) - 1
+        rows.append(row)
+        match = pattern.search(text, starts[row + 1])
+    return rows
+
+
+def _by_value(check, values: list) -> dict:
+    """Check each distinct value once.
+
+    -> Return a dict() of row index -> error for the invalid rows.
+    """
+    verdicts = {value: check(value) for value in set(values)}
+    invalid = {value for value, error in verdicts.items() if error}
+    if not invalid:
+        return dict()
+    return {row: verdicts[value] for row, value in enumerate(values)
+            if value in invalid}
+
+
+def _check_name(values: list) -> dict:
+    """Get the errors of the network names."""
+    errors = dict.fromkeys(
+        _invalid_rows(utils.NET_NAME_INVALID_CHARS, values),
+        utils.NET_NAME_ERROR)
+    errors.update(dict.fromkeys(
+        (row for row, value in enumerate(values) if not value),
+        utils.NET_NAME_BLANK_ERROR))
+    return errors
+
+
+def _check_tags(values: list) -> dict:
+    """Get the errors of the tags."""
+    return dict.fromkeys(
+        _invalid_rows(utils.TAGS_INVALID_CHARS, values), utils.TAGS_ERROR)
+
+
+def _net_type_error(value: str) -> str:
+    """Get the error of a network types value, or None if valid."""
+    if utils.NET_TYPE_INVALID_CHARS.search(value):
+        return utils.NET_TYPE_CHARS_ERROR
+    if not utils.NET_TYPES.issuperset(value.split()):
+        return utils.NET_TYPE_ERROR
+    return None
+
+
+def _check_type(values: list) -> dict:
+    """Get the errors of the network types."""
+    return _by_value(_net_type_error, values)
+
+
+def _device_code_error(value: str) -> str:
+    """Get the error of a device codes value, or None if valid."""
+    codes = value.split()
+    if not codes:
+        return utils.DEVICE_CODE_BLANK_ERROR
+    for code in codes:
+        if code.lower() not in DEVICE_CODE_TABLE:
+            return (
+                f"Data Error: Invalid device code '{code}'! "
+                f'Valid device codes are {utils.DEVICE_CODES}.')
+    return None
+
+
+def _check_device_codes(values: list) -> dict:
+    """Get the errors of the device codes."""
+    return _by_value(_device_code_error, values)
+
+
+def _check_time_zone(values: list) -> dict:
+    """Get the errors of the time zones."""
+    return _by_value(
+        lambda value: None if value in TIME_ZONES else TIME_ZONE_ERROR,
+        values)
+
+
+# Column name -> column check
+RULES = {
+    'name': _check_name,
+    'tags': _check_tags,
+    'type': _check_type,
+    'deviceCodes': _check_device_codes,
+    'timeZone': _check_time_zone
+    }
+
+
+def validate_columns(columns: dict) -> dict:
+    """Validate the columns of the bulk network specs.
+
+    - columns (dict): column name -> list of the column's values. All the
+      columns have the same number of rows. The column names are:
+        + 'name': network names
+        + 'tags': tags separated by space
+        + 'type': network types separated by space
+        + 'deviceCodes': device codes separated by space, e.g. 'MX MS'
+        + 'timeZone': time zones
+    -> Return a dict() of row index -> list of (column name, error message)
+       for every invalid row. An empty dict() if all the rows are valid.
+    -> Raise ValueError if a column name is unknown or if the columns don't
+       have the same number of rows.
+    """
+    unknown = set(columns) - set(RULES)
+    if unknown:
+        raise ValueError(
+            f'Data Error: Unknown columns {sorted(unknown)}! '
+            f'Valid columns are {list(RULES)}.')
+    if len({len(values) for values in columns.values()}) > 1:
+        raise ValueError(
+            'Data Error: The columns have a different number of rows!')
+
+    errors = dict()
+    for column, values in columns.items():
+        for row, error in RULES[column](values).items():
+            errors.setdefault(row, []).append((column, error))
+    return dict(sorted(errors.items()))
+
+
+def validate_rows(rows: list) -> dict:
+    """Validate the bulk network specs row by row.
+
+    - rows (list): a list of dict() with the column names of
+      validate_columns(). All the rows have the same columns.
+    -> Return the errors as validate_columns() does.
+    """
+    if not rows:
+        return dict()
+    return validate_columns(
+        {column: [row[column] for row in rows] for column in rows[0]})
+
+
+def to_net_types(device_codes: list) -> list:
+    """Get the network types of each device codes value.
+    ** Note: the device codes need to be validated first. Each distinct
+    value is resolved once.
+
+    - device_codes (list): device codes separated by space, e.g. 'MX MS'
+    -> Return a list of the network types separated by space,
+       e.g. 'appliance switch'
+    """
+    table = DEVICE_CODE_TABLE
+    net_types = {
+        value: ' '.join(table[code.lower()] for code in value.split())
+        for value in set(device_codes)
+        }
+    return [net_types[value] for value in device_codes]
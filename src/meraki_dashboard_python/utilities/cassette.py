@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""Cassette Module.
+
+This module records the Meraki dashboard API traffic of a session into a
+cassette file and replays it, so the workflows can be benchmarked repeatably
+offline, without the API key and without the noise of the real API timings.
+
+- RecordingAdapter: a requests transport adapter which sends the requests
+  and appends each request/response pair and its timing to the cassette.
+  The API key headers are redacted.
+- ReplayAdapter: a requests transport adapter which serves the recorded
+  responses back, at the recorded speed or accelerated, without sending
+  anything.
+
+The cassette is a JSON lines file: one request/response pair per line.
+"""
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+REDACTED_HEADERS = {'x-cisco-meraki-api-key', 'authorization', 'cookie',
+                    'set-cookie'}
+
+
+def _redact(headers) -> dict:
+    """Redact the API key and cookie headers."""
+    return {k: '<redacted>' if k.lower() in REDACTED_HEADERS else v
+            for k, v in headers.items()}
+
+
+def _body(body) -> str:
+    """Decode a request body."""
+    if isinstance(body, bytes):
+        return body.decode('utf-8', 'replace')
+    return body
+
+
+def _key(method: str, url: str, body) -> str:
+    """Get the key matching a request with its recorded responses.
+    ** Note: the scheme and the host are ignored, so a cassette recorded with
+    a base URL can be replayed with another one.
+    """
+    parts = urlsplit(url)
+    return f'{method} {parts.path}?{parts.query} {_body(body) or ""}'
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Send the requests and record them into a cassette.
+
+    - path (string): cassette file, overwritten.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()  # The session is shared by threads
+        self._file = open(path, 'w')
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        elapsed = time.perf_counter() - start
+        line = json.dumps({
+            'request': {
+                'method': request.method,
+                'url': request.url,
+                'headers': _redact(request.headers),
+                'body': _body(request.body)},
+            'response': {
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': _redact(response.headers),
+                'body': response.text},
+            'elapsed': elapsed
+            }) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+        return response
+
+    def close(self):
+        super().close()
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serve the recorded responses of a cassette.
+    ** Note: the responses of a repeated request are served in the recorded
+    order; the last one is served again once they're all used.
+
+    - path (string): cassette file.
+    - speed (float): replay speed relative to the recorded timings,
+      e.g. 1 for the recorded speed, 10 for 10x faster. 0 serves the
+      responses without waiting.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0):
+        super().__init__()
+        self._speed = speed
+        self._recorded = dict()
+        self._served = dict()
+        self._lock = threading.Lock()  # The session is shared by threads
+        with open(path) as a_file:
+            for line in a_file:
+                entry = json.loads(line)
+                request = entry['request']
+                self._recorded.setdefault(_key(
+                    request['method'], request['url'], request['body']),
+                    []).append(entry)
+
+    def send(self, request, **kwargs):
+        key = _key(request.method, request.url, request.body)
+        entries = self._recorded.get(key)
+        if not entries:
+            raise requests.exceptions.ConnectionError(
+                f'No recorded response for {request.method} {request.url}',
+                request=request)
+        with self._lock:
+            i = self._served.get(key, 0)
+            self._served[key] = i + 1
+        entry = entries[min(i, len(entries) - 1)]
+        if self._speed:
+            time.sleep(entry['elapsed'] / self._speed)
+
+        recorded = entry['response']
+        response = requests.Response()
+        response.status_code = recorded['status']
+        response.reason = recorded['reason']
+        response.headers = CaseInsensitiveDict(recorded['headers'])
+        response.headers.pop('Content-Encoding', None)  # Stored decoded
+        response.encoding = 'utf-8'
+        response._content = recorded['body'].encode('utf-8')
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def attach(req_session: requests.Session, record: str = None,
+           replay: str = None, replay_speed: float = 1.0):
+    """Record or replay the traffic of a requests session.
+
+    - req_session (requests.Session object): the session's HTTP transport.
+    - record (string): cassette file to record into.
+    - replay (string): cassette file to replay from.
+    - replay_speed (float): see ReplayAdapter.
+    -> Return the mounted adapter, None if neither recording nor replaying.
+       It's closed, and the cassette with it, by closing the session.
+    """
+    if record and replay:
+        raise ValueError(
+            "Data Error: A session can't record and replay at the same time!")
+    if record:
+        adapter = RecordingAdapter(record)
+    elif replay:
+        adapter = ReplayAdapter(replay, speed=replay_speed)
+    else:
+        return None
+    req_session.mount('https://', adapter)
+    req_session.mount('http://', adapter)
+    return adapter
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+"""Device claiming Module.
+
+This module claims thousands of Meraki devices into the networks of an
+organization in bulk:
+
+1. The serials, models and network names are read from a CSV file.
+2. The product types each network requires are derived offline from the
+   models' prefixes via utils.PRODUCT_TYPES, e.g. MX68 -> appliance.
+3. The matching networks are picked from the organization's networks, or
+   created with the required product types.
+4. The devices are claimed in batches (many serials per request),
+   concurrently under the per-organization rate limit, and the result of
+   each row is returned.
+"""
+import csv
+import re
+from concurrent.futures import ThreadPoolExecutor
+import meraki
+from utilities import inventory
+from utilities import ratelimit
+from utilities import utils
+
+SERIAL_REGEX = re.compile(r'^[A-Z0-9]{4}-[A-Z0-9]{4}-[A-Z0-9]{4}$')
+CLAIM_BATCH_SIZE = 100  # Serials per claimNetworkDevices request
+# Network types in the PRODUCT_TYPES order, e.g. 'appliance switch'
+NET_TYPE_ORDER = {v: i for i, v in enumerate(utils.PRODUCT_TYPES.values())}
+
+
+def model_net_type(model: str) -> str:
+    """Get the network type of a device model from its prefix.
+
+    - model (string): device model, e.g. 'MX68', 'MS120-8LP', 'MR33'
+    -> Return the network type, e.g. 'appliance'
+    -> Raise ValueError if the model's prefix is not a valid device code.
+    """
+    return utils.PRODUCT_TYPES[utils.validate_device_code(model.strip()[:2])]
+
+
+def read_devices(path: str) -> list:
+    """Read the devices from a CSV file.
+
+    - path (string): CSV file with the 'serial', 'model' and 'network'
+      (network name) columns.
+    -> Return a list of dict() with the 'serial', 'model' and 'network'.
+    """
+    with open(path, newline='') as a_file:
+        return [
+            {'serial': row['serial'].strip().upper(),
+             'model': row['model'].strip(),
+             'network': row['network'].strip()}
+            for row in csv.DictReader(a_file)
+            ]
+
+
+def group_devices(devices: list) -> tuple:
+    """Group the devices by network and derive each network's types.
+
+    - devices (list): see read_devices()
+    -> Return a tuple of:
+       + a dict() of network name -> {'productTypes': set, 'serials': list}
+       + a dict() of row index -> error message of the invalid rows.
+    """
+    groups = dict()
+    errors = dict()
+    seen = dict()  # serial -> row index
+    for i, device in enumerate(devices):
+        serial = device['serial']
+        if not SERIAL_REGEX.match(serial):
+            errors[i] = f"Data Error: Invalid serial '{serial}'!"
+            continue
+        if serial in seen:
+            errors[i] = (f"Data Error: Duplicate serial '{serial}' "
+                         f'(row {seen[serial]})!')
+            continue
+        seen[serial] = i
+        try:
+            net_type = model_net_type(device['model'])
+            utils.validate_net_name(device['network'])
+        except ValueError as err:
+            errors[i] = str(err)
+            continue
+        group = groups.setdefault(
+            device['network'], {'productTypes': set(), 'serials': []})
+        group['productTypes'].add(net_type)
+        group['serials'].append(serial)
+    return groups, errors
+
+
+def resolve_networks(org_networks: list, groups: dict) -> tuple:
+    """Pick the existing networks matching the groups.
+    ** Note: a combined and a standalone network can have the same name (see
+    utils.get_networks), the one having all the required product types is
+    picked, e.g. a combined appliance/wireless network for wireless devices.
+
+    - org_networks (list): an organization's networks list.
+    - groups (dict): see group_devices()
+    -> Return a tuple of:
+       + a dict() of network name -> existing network ID,
+       + a list of the network names to be created,
+       + a dict() of network name -> error message.
+    """
+    existing = dict()
+    to_create = list()
+    errors = dict()
+    for name, group in groups.items():
+        required = group['productTypes']
+        networks = utils.get_networks(org_networks, name)
+        network = next((net for net in networks
+                        if required.issubset(net['productTypes'])), None)
+        if network is not None:
+            existing[name] = network['id']
+        elif not networks:
+            to_create.append(name)
+        else:
+            missing = min((required - set(net['productTypes'])
+                           for net in networks), key=len)  # Closest one
+            errors[name] = (
+                f"Data Error: The network '{name}' has no product types "
+                f"{sorted(missing)}!")
+    return existing, to_create, errors
+
+
+def claim_devices(dashboard: meraki.DashboardAPI, org: dict, devices: list,
+                  net_inventory: inventory.NetworkInventory,
+                  limiter: ratelimit.RateLimiter = None,
+                  batch_size: int = CLAIM_BATCH_SIZE,
+                  max_workers: int = 8) -> list:
+    """Claim the devices into their networks, creating the missing ones.
+    ** Note: if a batch is rejected, its serials are claimed one by one so
+    each serial gets its own result.
+
+    - dashboard (meraki.DashboardAPI object): authenticated DashboardAPI
+      session.
+    - org (dict): a unique organization, see utils.filter_orgs()
+    - devices (list): see read_devices()
+    - net_inventory (inventory.NetworkInventory object): networks cache,
+      the created networks are added to it.
+    - limiter (ratelimit.RateLimiter object): shared rate limiter.
+    - batch_size (integer): serials per claim request.
+    - max_workers (integer): number of concurrent requests.
+    -> Return a list of the rows' results in the devices order, each a dict()
+       with the 'serial', 'networkId' and 'error' (None if the serial is
+       claimed). A duplicate serial's first row is claimed, its other rows
+       get a duplicate error.
+    """
+    limiter = limiter or ratelimit.RateLimiter()
+    groups, row_errors = group_devices(devices)
+    net_ids, to_create, net_errors = resolve_networks(
+        net_inventory.get_networks(org['id']), groups)
+    results = dict()  # serial -> {'networkId', 'error'}
+
+    def create(name):
+        limiter.acquire(org['id'])
+        net_type = ' '.join(sorted(groups[name]['productTypes'],
+                                   key=NET_TYPE_ORDER.get))
+        try:
+            network = dashboard.networks.createOrganizationNetwork(
+                organizationId=org['id'], name=name, type=net_type,
+                timeZone=utils.DEFAULT_TIME_ZONE)
+        except meraki.APIError as err:
+            return name, None, f'-> Meraki API error: {err}'
+        net_inventory.upsert_network(org['id'], network)
+        return name, network['id'], None
+
+    def claim(batch):
+        network_id, serials = batch
+        limiter.acquire(org['id'])
+        try:
+            dashboard.devices.claimNetworkDevices(
+                network_id, serials=serials)
+        except meraki.APIError as err:
+            if len(serials) == 1:
+                return {serials[0]: {'networkId': network_id,
+                                     'error': f'-> Meraki API error: {err}'}}
+            batch_results = dict()
+            for serial in serials:  # Isolate the rejected serials
+                batch_results.update(claim((network_id, [serial])))
+            return batch_results
+        return {serial: {'networkId': network_id, 'error': None}
+                for serial in serials}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for name, network_id, error in executor.map(create, to_create):
+            if error is None:
+                net_ids[name] = network_id
+            else:
+                net_errors[name] = error
+        batches = list()
+        for name, group in groups.items():
+            if name in net_errors:
+                results.update(
+                    {serial: {'networkId': None, 'error': net_errors[name]}
+                     for serial in group['serials']})
+                continue
+            serials = group['serials']
+            batches.extend(
+                (net_ids[name], serials[i:i + batch_size])
+                for i in range(0, len(serials), batch_size))
+        for batch_results in executor.map(claim, batches):
+            results.update(batch_results)
+    return [
+        {'serial': device['serial'], 'networkId': None,
+         'error': row_errors[i]} if i in row_errors
+        else {'serial': device['serial'], **results[device['serial']]}
+        for i, device in enumerate(devices)
+        ]
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""Daemon Module.
+
+This module defines the local daemon which keeps an authenticated
+DashboardAPI session, its connection pool and the organizations/networks
+caches warm, and serves them to the thin clients (see the daemonclient
+module) over a Unix domain socket. The socket is only accessible by the user
+running the daemon.
+"""
+import json
+import os
+import socketserver
+import threading
+import time
+from utilities import daemonclient
+from utilities import inventory
+from utilities import utils
+
+
+class DashboardDaemon(socketserver.ThreadingUnixStreamServer):
+    """Serve a warm DashboardAPI session over a Unix domain socket.
+
+    - auth: authentication value
+    - socket_path (string): the Unix domain socket to listen on.
+    - ttl (float): seconds before the cached organizations and networks are
+      re-fetched.
+    - session_options: any other init_dashboard_session() options,
+      e.g. base_url.
+    -> Raise ValueError if the API key is not authorised, if another daemon
+       is already serving the socket, or if the socket or its directory is
+       owned by another user.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, auth, socket_path: str = daemonclient.DEFAULT_SOCKET,
+                 ttl: float = 300, **session_options):
+        if daemonclient.is_running(socket_path):
+            raise ValueError(
+                'Daemon Error: A daemon is already serving '
+                f"'{socket_path}'!")
+        try:
+            daemonclient.secure_socket_dir(socket_path)
+            if os.path.lexists(socket_path):
+                daemonclient.check_owner(socket_path)
+        except PermissionError as err:
+            raise ValueError(str(err)) from err
+        session = utils.init_dashboard_session(auth, **session_options)
+        self.dashboard = session['dashboardAPI']
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._orgs = session['organizations']
+        self._orgs_fetched = time.monotonic()
+        self.inventory = inventory.NetworkInventory(
+            lambda org_id: utils.dedup_get(
+                self.dashboard, 'networks.getOrganizationNetworks', org_id),
+            ttl=ttl)
+        self.started = time.time()
+        if os.path.lexists(socket_path):
+            os.unlink(socket_path)  # Stale socket of a stopped daemon
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+        self.operations = {
+            'ping': self.ping,
+            'organizations': self.organizations,
+            'networks': self.networks,
+            'invalidate': self.invalidate,
+            'stats': self.stats,
+            'shutdown': self.stop
+            }
+
+    def server_close(self):
+        super().server_close()
+        utils.close_session(self.dashboard)
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+    def ping(self) -> dict:
+        """Get the daemon's process ID and uptime."""
+        return {'pid': os.getpid(), 'uptime': time.time() - self.started}
+
+    def organizations(self, refresh: bool = False) -> list:
+        """Get the cached organizations list."""
+        with self._lock:
+            if refresh or time.monotonic() - self._orgs_fetched > self._ttl:
+                self._orgs = utils.dedup_get(
+                    self.dashboard, 'organizations.getOrganizations')
+                self._orgs_fetched = time.monotonic()
+            return self._orgs
+
+    def networks(self, org_name: str, refresh: bool = False) -> list:
+        """Get the cached networks of a unique organization name."""
+        org = utils.filter_orgs(
+            orgs=self.organizations(), org_name=org_name, unique_org=True)
+        return self.inventory.get_networks(org['id'], refresh=refresh)
+
+    def invalidate(self) -> bool:
+        """Drop the cached organizations and networks."""
+        with self._lock:
+            self._orgs_fetched = float('-inf')
+        self.inventory.invalidate()
+        return True
+
+    def stats(self) -> dict:
+        """Get the dedup hit counts of the daemon's API calls."""
+        return utils.get_dedup_stats()
+
+    def stop(self) -> bool:
+        """Stop serving once the current request is answered."""
+        threading.Thread(target=self.shutdown, daemon=True).start()
+        return True
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Answer the JSON lines requests of a client connection."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                params = json.loads(line)
+                op = params.pop('op', None)
+                if op not in self.server.operations:
+                    raise ValueError(
+                        f"Daemon Error: Unknown operation '{op}'!")
+                response = {'ok': True,
+                            'result': self.server.operations[op](**params)}
+            except (TypeError, ValueError, UserWarning) as err:
+                response = {'ok': False, 'error': str(err)}
+            except Exception as err:  # Keep serving the other requests
+                response = {'ok': False, 'error': f'-> {err}'}
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+def serve(auth, socket_path: str = daemonclient.DEFAULT_SOCKET,
+          **options):
+    """Run the daemon until a client sends the 'shutdown' operation.
+
+    - auth: authentication value
+    - socket_path (string): the Unix domain socket to listen on.
+    - options: see DashboardDaemon.
+    """
+    with DashboardDaemon(auth, socket_path=socket_path, **options) as server:
+        print(f'Meraki dashboard daemon listening on {socket_path}')
+        server.serve_forever()
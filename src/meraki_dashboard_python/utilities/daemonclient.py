@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""Daemon client Module.
+
+This module is the thin client of the local daemon (see the daemon module).
+It only uses the standard library, so a CLI invocation talking to a running
+daemon doesn't pay the Meraki SDK import, the authentication or a fresh
+getOrganizations call.
+
+The socket lives in $XDG_RUNTIME_DIR, or else in a per-user directory only
+accessible by its owner, and the client only talks to a socket owned by the
+current user, so another local user can't impersonate the daemon.
+
+The protocol is one JSON object per line over a Unix domain socket:
+    request:  {"op": "<operation>", ...parameters}
+    response: {"ok": true, "result": ...} or {"ok": false, "error": "..."}
+"""
+import json
+import os
+import socket
+import stat
+import tempfile
+
+if os.environ.get('XDG_RUNTIME_DIR'):
+    DEFAULT_SOCKET = os.path.join(
+        os.environ['XDG_RUNTIME_DIR'], 'meraki-dashboard.sock')
+else:
+    DEFAULT_SOCKET = os.path.join(
+        tempfile.gettempdir(), f'meraki-dashboard-{os.getuid()}',
+        'daemon.sock')
+
+
+def check_owner(path: str):
+    """Check that a file (not followed if a symlink) is the current user's.
+
+    -> Raise PermissionError if the file is owned by another user.
+    """
+    if os.lstat(path).st_uid != os.getuid():
+        raise PermissionError(
+            f"Daemon Error: '{path}' is owned by another user!")
+
+
+def secure_socket_dir(socket_path: str):
+    """Create the socket's directory if needed, only accessible by the
+    current user.
+
+    -> Raise PermissionError if the directory is another user's, unless it's
+       a shared sticky directory (e.g. /tmp) where the other users can't
+       replace the current user's socket.
+    """
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if info.st_uid != os.getuid() and not info.st_mode & stat.S_ISVTX:
+        raise PermissionError(
+            f"Daemon Error: '{directory}' is owned by another user!")
+
+
+def request(op: str, socket_path: str = DEFAULT_SOCKET,
+            timeout: float = 60, **params):
+    """Send a request to the daemon.
+
+    - op (string): operation, e.g. 'ping', 'organizations', 'networks'
+    - socket_path (string): the daemon's Unix domain socket.
+    - timeout (float): maximum seconds to wait for the response.
+    - params: the operation's parameters.
+    -> Return the result of the operation.
+    -> Raise ValueError if the operation has failed.
+    -> Raise OSError if the daemon is not running, or PermissionError if the
+       socket is owned by another user.
+    """
+    check_owner(socket_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps({'op': op, **params}).encode() + b'\n')
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    if not line:
+        raise ValueError('Daemon Error: The daemon closed the connection!')
+    response = json.loads(line)
+    if not response['ok']:
+        raise ValueError(response['error'])
+    return response['result']
+
+
+def is_running(socket_path: str = DEFAULT_SOCKET) -> bool:
+    """Check if the daemon is running."""
+    try:
+        request('ping', socket_path=socket_path, timeout=1)
+    except (OSError, ValueError):
+        return False
+    return True
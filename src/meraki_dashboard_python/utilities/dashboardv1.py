@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+"""Meraki Dashboard API v1 Module.
+
+This module defines the DashboardV1 class which is a small data access layer
+of the Meraki dashboard API v1. It prefers the organization-wide endpoints
+(organization devices, device statuses, uplink statuses and networks) so an
+inventory question takes a few paginated calls per organization instead of
+one call per network.
+"""
+import time
+import requests
+import meraki
+from utilities import singleflight
+
+V1_BASE_URL = "https://api.meraki.com/api/v1"
+# Maximum page sizes of the organization-wide endpoints
+PER_PAGE = {
+    'getOrganizationNetworks': 100000,
+    'getOrganizationDevices': 1000,
+    'getOrganizationDevicesStatuses': 1000,
+    'getOrganizationUplinksStatuses': 1000
+    }
+
+
+def _next_link(response: requests.Response) -> str:
+    """Get the URL of the next page from the response's Link header.
+
+    -> Return the next page's URL, or None for the last page.
+    """
+    return response.links.get('next', {}).get('url')
+
+
+class DashboardV1:
+    """Persistent Meraki dashboard API v1 session.
+
+    - api_key (string): Meraki dashboard API key.
+    - base_url (string): preceding all endpoint resources.
+    - single_request_timeout (integer): maximum seconds for each API call.
+    - maximum_retries (integer): retry up to this many times when
+      encountering 429s or other server-side errors.
+    - single_flight (singleflight.SingleFlight object): coalesce identical
+      in-flight GET requests if provided.
+    """
+
+    def __init__(self, api_key: str, base_url: str = V1_BASE_URL,
+                 single_request_timeout: int = 60, maximum_retries: int = 3,
+                 single_flight: singleflight.SingleFlight = None):
+        if not api_key:
+            raise meraki.APIKeyError()
+        self._api_key = str(api_key)
+        self._base_url = base_url.rstrip('/')
+        self._single_request_timeout = single_request_timeout
+        self._maximum_retries = maximum_retries
+        self._single_flight = single_flight
+        self._req_session = requests.Session()
+        self._req_session.headers.update({
+            'Authorization': f'Bearer {self._api_key}',
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'})
+
+    def request(self, operation: str, method: str, url: str,
+                **kwargs) -> requests.Response:
+        """Send a request, retrying rate-limited and server-side errors.
+
+        - operation (string): operation name used in raised errors.
+        - method (string): HTTP method.
+        - url (string): endpoint resource or absolute URL.
+        -> Return the requests.Response object of a 2XX response.
+        -> Raise meraki.APIError if the request has failed.
+        """
+        metadata = {'tags': ['v1'], 'operation': operation}
+        abs_url = url if url.startswith('http') else self._base_url + url
+        kwargs.setdefault('timeout', self._single_request_timeout)
+        response = None
+        for _ in range(self._maximum_retries):
+            try:
+                response = self._req_session.request(method, abs_url, **kwargs)
+            except requests.exceptions.RequestException:
+                time.sleep(1)
+                continue
+            if response.ok:
+                return response
+            if response.status_code == 429:
+                time.sleep(int(response.headers.get('Retry-After', 1)))
+            elif response.status_code >= 500:
+                time.sleep(1)
+            else:
+                break
+        raise meraki.APIError(metadata, response)
+
+    def get(self, operation: str, url: str, params: dict = None):
+        """Send a GET request.
+
+        -> Return the decoded JSON response.
+        """
+        def _get():
+            response = self.request(operation, 'GET', url, params=params)
+            return response.json() if response.text.strip() else None
+        return self._coalesce(operation, [url, params], _get)
+
+    def get_pages(self, operation: str, url: str, params: dict = None,
+                  total_pages: int = -1) -> list:
+        """Send a GET request and follow the Link header's next pages.
+
+        - total_pages (integer): number of pages to fetch, -1 for all pages.
+        -> Return a list of all the pages' items.
+        """
+        params = dict(params or {})
+        params.setdefault('perPage', PER_PAGE.get(operation))
+
+        def _get_pages():
+            response = self.request(operation, 'GET', url, params=params)
+            results = response.json()
+            pages = 1
+            next_url = _next_link(response)
+            while next_url and pages != total_pages:
+                response = self.request(operation, 'GET', next_url)
+                results.extend(response.json())
+                pages += 1
+                next_url = _next_link(response)
+            return results
+        return self._coalesce(operation, [url, params, total_pages],
+                              _get_pages)
+
+    def post(self, operation: str, url: str, json: dict = None):
+        """Send a POST request.
+
+        -> Return the decoded JSON response.
+        """
+        response = self.request(operation, 'POST', url, json=json)
+        return response.json() if response.text.strip() else None
+
+    def _coalesce(self, operation: str, params: list, func):
+        """Call func once per identical in-flight GET request."""
+        if self._single_flight is None:
+            return func()
+        key = singleflight.request_key(
+            endpoint=operation, params=params, auth=self._api_key,
+            base_url=self._base_url)
+        return self._single_flight.do(key, func)
+
+    def getOrganizations(self) -> list:
+        """List the organizations that the user has privileges on."""
+        return self.get('getOrganizations', '/organizations')
+
+    def getOrganizationNetworks(self, organizationId: str,
+                                **params) -> list:
+        """List the networks that the user has privileges on in an
+        organization.
+        """
+        return self.get_pages(
+            'getOrganizationNetworks',
+            f'/organizations/{organizationId}/networks', params)
+
+    def getOrganizationDevices(self, organizationId: str, **params) -> list:
+        """List the devices in an organization."""
+        return self.get_pages(
+            'getOrganizationDevices',
+            f'/organizations/{organizationId}/devices', params)
+
+    def getOrganizationDevicesStatuses(self, organizationId: str,
+                                       **params) -> list:
+        """List the status of every Meraki device in the organization."""
+        return self.get_pages(
+            'getOrganizationDevicesStatuses',
+            f'/organizations/{organizationId}/devices/statuses', params)
+
+    def getOrganizationUplinksStatuses(self, organizationId: str,
+                                       **params) -> list:
+        """List the uplink status of every Meraki MX, MG and Z series
+        device in the organization.
+        """
+        return self.get_pages(
+            'getOrganizationUplinksStatuses',
+            f'/organizations/{organizationId}/uplinks/statuses', params)
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+"""Configuration drift Module.
+
+This module defines the DriftScanner class which finds the networks whose
+settings have drifted from a standard, e.g. the time zone, the tags and the
+product types, and the VLAN or SSID settings.
+
+- The 'general' section (timeZone, tags, productTypes) comes from the
+  networks list itself, so it doesn't need any extra API call.
+- The other sections are fetched per network, concurrently, under the
+  per-organization rate limit.
+- A stable content hash is kept per network and section. On the later scans,
+  a section is only re-fetched if it's likely to have changed: the network is
+  new, its 'general' hash has changed, it was marked as changed (e.g. by a
+  webhook event) or the section is older than its maximum age. The drift of
+  an unchanged section isn't re-compared either.
+"""
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import meraki
+from utilities import ratelimit
+from utilities import tags as net_tags
+from utilities import utils
+
+DEFAULT_STANDARD = {'general': {'timeZone': utils.DEFAULT_TIME_ZONE}}
+DEFAULT_MAX_AGE = 24 * 60 * 60  # Seconds before a section is re-fetched
+
+
+def content_hash(data) -> str:
+    """Get a stable hash of any JSON serializable data."""
+    return hashlib.sha256(json.dumps(
+        data, sort_keys=True, separators=(',', ':'),
+        default=str).encode()).hexdigest()[:16]
+
+
+def general_section(network: dict) -> dict:
+    """Get the 'general' section of a network from the networks list."""
+    return {
+        'timeZone': network.get('timeZone'),
+        'tags': sorted(net_tags.get_net_tags(network)),
+        'productTypes': sorted(network.get('productTypes') or [])
+        }
+
+
+def sdk_fetchers(dashboard: meraki.DashboardAPI) -> dict:
+    """Get the section fetchers of the VLAN and SSID settings.
+
+    - dashboard (meraki.DashboardAPI object): authenticated DashboardAPI
+      session.
+    -> Return a dict() of section -> fetch(network), where fetch returns
+       None if the section doesn't apply to the network.
+    """
+    def vlans(network):
+        if 'appliance' not in network.get('productTypes', []):
+            return None
+        try:
+            return dashboard.vlans.getNetworkVlans(network['id'])
+        except meraki.APIError as err:
+            if err.status == 400:  # VLANs are not enabled
+                return None
+            raise
+
+    def ssids(network):
+        if 'wireless' not in network.get('productTypes', []):
+            return None
+        return dashboard.ssids.getNetworkSsids(network['id'])
+
+    return {'vlans': vlans, 'ssids': ssids}
+
+
+def compare(data, expected: dict, path: str = '') -> list:
+    """Compare a section with its standard.
+    ** Note: the 'tags' standard lists the required tags, the 'productTypes'
+    standard is compared regardless of the order and a list section (e.g. the
+    SSIDs) is compared item by item.
+
+    -> Return a list of (field, expected, actual) for each drifted field.
+    """
+    if isinstance(data, list):
+        drift = list()
+        for i, item in enumerate(data):
+            key = item.get('number', item.get('id', i))
+            drift.extend(compare(item, expected, f'{path}{key}.'))
+        return drift
+    drift = list()
+    for field, value in expected.items():
+        actual = data.get(field)
+        if field == 'tags':
+            missing = set(value) - set(actual or [])
+            if missing:
+                drift.append((f'{path}{field}', sorted(missing), actual))
+        elif field == 'productTypes':
+            if sorted(value) != sorted(actual or []):
+                drift.append((f'{path}{field}', sorted(value), actual))
+        elif actual != value:
+            drift.append((f'{path}{field}', value, actual))
+    return drift
+
+
+class DriftScanner:
+    """Scan the networks for configuration drift.
+
+    - standard (dict): section -> {field: expected value}.
+      Default: DEFAULT_STANDARD.
+    - fetchers (dict): section -> fetch(network) of the sections which are
+      not in the networks list, e.g. sdk_fetchers(dashboard).
+    - state_file (string): JSON file keeping the hashes between the runs.
+    - max_age (dict): section -> seconds before the section is re-fetched.
+    - limiter (ratelimit.RateLimiter object): shared rate limiter.
+    - max_workers (integer): number of concurrent fetches.
+    """
+
+    def __init__(self, standard: dict = None, fetchers: dict = None,
+                 state_file: str = None, max_age: dict = None,
+                 limiter: ratelimit.RateLimiter = None,
+                 max_workers: int = 8):
+        self._standard = standard or DEFAULT_STANDARD
+        self._fetchers = fetchers or dict()
+        self._state_file = state_file
+        self._max_age = max_age or dict()
+        self._limiter = limiter or ratelimit.RateLimiter()
+        self._max_workers = max_workers
+        self._changed = set()
+        self._state = dict()  # network_id -> section -> entry
+        if state_file and os.path.exists(state_file):
+            with open(state_file) as a_file:
+                self._state = json.load(a_file)
+
+    def save(self):
+        """Save the hashes and the drift to the state file."""
+        if self._state_file:
+            with open(self._state_file, 'w') as a_file:
+                json.dump(self._state, a_file)
+
+    def mark_changed(self, network_id: str):
+        """Re-fetch all the sections of a network on the next scan."""
+        self._changed.add(network_id)
+
+    def on_webhook(self, event: dict):
+        """Mark the network of a webhook event as changed, see
+        webhooks.WebhookReceiver.add_listener()
+        """
+        if event.get('networkId'):
+            self.mark_changed(event['networkId'])
+
+    def _is_stale(self, network_id: str, section: str, general_changed: bool,
+                  now: float) -> bool:
+        """Check if a network's section is likely to have changed."""
+        entry = self._state.get(network_id, {}).get(section)
+        return (
+            entry is None or general_changed or network_id in self._changed
+            or now - entry['checked'] > self._max_age.get(
+                section, DEFAULT_MAX_AGE))
+
+    def _update(self, network_id: str, section: str, data, now: float):
+        """Update a network's section entry with freshly fetched data."""
+        digest = content_hash(data)
+        standard = self._standard.get(section)
+        standard_digest = content_hash(standard)
+        entries = self._state.setdefault(network_id, {})
+        entry = entries.get(section)
+        if (entry is None or entry['hash'] != digest or
+                entry['standard'] != standard_digest):
+            drift = list() if data is None or not standard else [
+                list(item) for item in compare(data, standard)]
+            entry = {'hash': digest, 'standard': standard_digest,
+                     'drift': drift}
+        entry['checked'] = now
+        entries[section] = entry
+
+    def scan(self, org_id: str, org_networks: list) -> dict:
+        """Scan an organization's networks.
+
+        - org_id (string): organization ID.
+        - org_networks (list): the organization's networks list, fetched or
+          cached.
+        -> Return a dict() of the scan's counters ('networks', 'fetched'),
+           the fetch 'errors' and the 'drift' list, each a dict() with the
+           'networkId', 'name', 'section', 'field', 'expected' and 'actual'
+           values.
+        """
+        now = time.time()
+        jobs = list()
+        # The marks consumed by this scan, not the ones arriving during it
+        consumed = self._changed & {net['id'] for net in org_networks}
+        for net in org_networks:
+            general = general_section(net)
+            previous = self._state.get(net['id'], {}).get('general')
+            general_changed = (
+                previous is not None and
+                previous['hash'] != content_hash(general))
+            self._update(net['id'], 'general', general, now)
+            for section in self._fetchers:
+                if self._is_stale(net['id'], section, general_changed, now):
+                    jobs.append((net, section))
+
+        def fetch(job):
+            net, section = job
+            self._limiter.acquire(org_id)
+            try:
+                return self._fetchers[section](net), None
+            except meraki.APIError as err:
+                return None, err
+            except Exception as err:  # Keep scanning the other networks
+                return None, f'{type(err).__name__}: {err}'
+
+        fetched = dict.fromkeys(self._fetchers, 0)
+        errors = list()
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            for (net, section), (data, err) in zip(
+                    jobs, executor.map(fetch, jobs)):
+                if err is not None:  # Kept stale, re-fetched next scan
+                    errors.append({'networkId': net['id'],
+                                   'section': section, 'error': str(err)})
+                    continue
+                self._update(net['id'], section, data, now)
+                fetched[section] += 1
+
+        failed = {error['networkId'] for error in errors}
+        self._changed -= consumed - failed
+        # The failed networks' stale sections may not be stale by age, or
+        # their general section has already been updated
+        self._changed |= failed
+        report = {'networks': len(org_networks), 'fetched': fetched,
+                  'errors': errors, 'drift': list()}
+        for net in org_networks:
+            for section, entry in self._state[net['id']].items():
+                for field, expected, actual in entry['drift']:
+                    report['drift'].append({
+                        'networkId': net['id'], 'name': net.get('name'),
+                        'section': section, 'field': field,
+                        'expected': expected, 'actual': actual})
+        self.save()
+        return report
+
+
+def format_report(report: dict) -> str:
+    """Format a drift report, one line per drifted field."""
+    lines = [
+        f"Scanned {report['networks']} networks, fetched "
+        + ', '.join(f'{k}: {v}' for k, v in report['fetched'].items())
+        + f", errors: {len(report['errors'])}"
+        + f", drifted fields: {len(report['drift'])}"
+        ]
+    for drift in report['drift']:
+        lines.append(
+            f"{drift['name']} ({drift['networkId']}) {drift['section']}."
+            f"{drift['field']}: expected {drift['expected']!r}, "
+            f"actual {drift['actual']!r}")
+    return '\n'.join(lines)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""Network inventory Module.
+
+This module defines the NetworkInventory class which caches the networks of
+the Meraki dashboard organizations, so a workflow can resolve many network
+names against a single fetched networks list instead of one API call each.
+"""
+import threading
+import time
+
+
+class NetworkInventory:
+    """Cache of the organizations' networks.
+
+    - fetch (callable): fetch(org_id) returns the organization's networks
+      list, e.g. a partial of utils.dedup_get with
+      'networks.getOrganizationNetworks'.
+    - ttl (float): seconds before a cached networks list is re-fetched.
+    """
+
+    def __init__(self, fetch, ttl: float = 300):
+        self._fetch = fetch
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._orgs = dict()  # org_id -> {'fetched': float, 'networks': dict}
+
+    def get_networks(self, org_id: str, refresh: bool = False) -> list:
+        """Get an organization's networks, fetching them if not cached.
+
+        - org_id (string): organization ID.
+        - refresh (bool): re-fetch even if the cached list is still fresh.
+        -> Return the organization's networks list.
+        """
+        with self._lock:
+            cached = self._orgs.get(org_id)
+            if (cached is not None and not refresh and
+                    time.monotonic() - cached['fetched'] < self._ttl):
+                return list(cached['networks'].values())
+        networks = self._fetch(org_id) or list()
+        with self._lock:
+            self._orgs[org_id] = {
+                'fetched': time.monotonic(),
+                'networks': {net['id']: net for net in networks}}
+        return list(networks)
+
+    def is_cached(self, org_id: str) -> bool:
+        """Check if an organization's networks are cached and fresh."""
+        with self._lock:
+            cached = self._orgs.get(org_id)
+            return (cached is not None and
+                    time.monotonic() - cached['fetched'] < self._ttl)
+
+    def invalidate(self, org_id: str = None):
+        """Drop the cached networks of an organization, or of all of them
+        if org_id is not provided.
+        """
+        with self._lock:
+            if org_id is None:
+                self._orgs.clear()
+            else:
+                self._orgs.pop(org_id, None)
+
+    def upsert_network(self, org_id: str, network: dict):
+        """Add or update a network in a cached organization.
+        ** Note: nothing is done if the organization is not cached.
+        """
+        with self._lock:
+            cached = self._orgs.get(org_id)
+            if cached is not None:
+                networks = cached['networks']
+                networks[network['id']] = {
+                    **networks.get(network['id'], {}), **network}
+
+    def remove_network(self, network_id: str) -> bool:
+        """Remove a network from the cache.
+
+        -> Return True if the network was cached. Otherwise, return False.
+        """
+        with self._lock:
+            for cached in self._orgs.values():
+                if cached['networks'].pop(network_id, None) is not None:
+                    return True
+        return False
+
+    def find_network(self, network_id: str) -> tuple:
+        """Find a cached network by ID.
+
+        -> Return a tuple of (org_id, network), or (None, None) if the
+           network is not cached.
+        """
+        with self._lock:
+            for org_id, cached in self._orgs.items():
+                network = cached['networks'].get(network_id)
+                if network is not None:
+                    return org_id, dict(network)
+        return None, None
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+"""Status monitor Module.
+
+This module defines the StatusMonitor class which continuously polls the
+organization-wide status endpoints (e.g. the device statuses of the API v1,
+see the dashboardv1 module) and only emits the records which have changed
+since the previous poll.
+
+- The last state is kept in a compact keyed store: an 8-byte digest per
+  record key (e.g. the device serial), instead of the full listings.
+- The changed records are emitted to callbacks, e.g. ndjson_sink().
+- Each organization's polling interval adapts to its observed change rate:
+  it's halved when records change and backs off when nothing changes. The
+  intervals are stretched if needed so all the organizations together stay
+  within the global rate budget.
+"""
+import hashlib
+import heapq
+import json
+import math
+import threading
+import time
+from utilities import dashboardv1
+
+
+def record_digest(record: dict) -> bytes:
+    """Get the 8-byte digest of a record."""
+    return hashlib.blake2b(
+        json.dumps(record, sort_keys=True, separators=(',', ':'),
+                   default=str).encode(), digest_size=8).digest()
+
+
+def ndjson_sink(stream):
+    """Get a callback writing the changes as NDJSON lines to a stream."""
+    def write(change: dict):
+        stream.write(json.dumps(change, separators=(',', ':')) + '\n')
+        stream.flush()
+    return write
+
+
+class StatusMonitor:
+    """Poll the organizations' statuses and emit the changed records.
+
+    - fetch (callable): fetch(org_id) returns the organization's status
+      records, e.g. DashboardV1.getOrganizationDevicesStatuses.
+    - org_ids (list): the organizations to be monitored.
+    - key_field (string): the field identifying a record.
+    - callbacks (list): callback(change) for each change, a dict() with the
+      'type' ('added', 'changed' or 'removed'), 'organizationId', 'key' and
+      'record' (None for 'removed').
+    - min_interval, max_interval (float): bounds of the polling interval of
+      an organization in seconds.
+    - rate_budget (float): calls per second allowed across all the
+      organizations' polls.
+    - page_size (integer): records per page, used to count the calls of a
+      poll.
+    """
+
+    def __init__(self, fetch, org_ids: list, key_field: str = 'serial',
+                 callbacks: list = None, min_interval: float = 30,
+                 max_interval: float = 900, rate_budget: float = 1.0,
+                 page_size: int = dashboardv1.PER_PAGE[
+                     'getOrganizationDevicesStatuses']):
+        self._fetch = fetch
+        self._key_field = key_field
+        self._callbacks = list(callbacks or [])
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._rate_budget = rate_budget
+        self._page_size = page_size
+        self._store = {org_id: dict() for org_id in org_ids}
+        self._intervals = dict.fromkeys(org_ids, min_interval)
+        self._calls = dict.fromkeys(org_ids, 1)
+        self._stop = threading.Event()
+        self.stats = {'polls': 0, 'changes': 0, 'errors': 0}
+
+    def add_callback(self, callback):
+        """Call callback(change) for each change."""
+        self._callbacks.append(callback)
+
+    def interval(self, org_id: str) -> float:
+        """Get the current polling interval of an organization."""
+        return self._intervals[org_id]
+
+    def poll_org(self, org_id: str) -> list:
+        """Poll an organization once and emit its changes.
+        ** Note: the first poll of an organization emits all its records as
+        'added'.
+
+        -> Return the list of the changes.
+        """
+        records = self._fetch(org_id)
+        self.stats['polls'] += 1
+        self._calls[org_id] = max(1, math.ceil(len(records) /
+                                               self._page_size))
+        store = self._store[org_id]
+        seen = set()
+        changes = list()
+        for record in records:
+            key = record[self._key_field]
+            seen.add(key)
+            digest = record_digest(record)
+            previous = store.get(key)
+            if previous != digest:
+                store[key] = digest
+                changes.append({
+                    'type': 'added' if previous is None else 'changed',
+                    'organizationId': org_id, 'key': key, 'record': record})
+        for key in set(store) - seen:
+            del store[key]
+            changes.append({
+                'type': 'removed', 'organizationId': org_id, 'key': key,
+                'record': None})
+
+        self._adapt(org_id, bool(changes))
+        self.stats['changes'] += len(changes)
+        for change in changes:
+            for callback in self._callbacks:
+                callback(change)
+        return changes
+
+    def _adapt(self, org_id: str, changed: bool):
+        """Adapt an organization's interval to its change rate, then fit
+        all the intervals in the global rate budget.
+        """
+        interval = self._intervals[org_id]
+        interval = interval / 2 if changed else interval * 1.5
+        self._intervals[org_id] = min(
+            self._max_interval, max(self._min_interval, interval))
+        # Calls per second of all the organizations at their intervals
+        usage = sum(self._calls[org] / self._intervals[org]
+                    for org in self._intervals)
+        if usage > self._rate_budget:
+            scale = usage / self._rate_budget
+            for org in self._intervals:
+                self._intervals[org] *= scale
+
+    def run(self, max_polls: int = None):
+        """Poll the organizations until stop() is called.
+
+        - max_polls (integer): stop after this number of polls, if provided.
+        """
+        self._stop.clear()
+        schedule = [(time.monotonic(), org_id) for org_id in self._store]
+        heapq.heapify(schedule)
+        polls = 0
+        while schedule and not self._stop.is_set():
+            due, org_id = heapq.heappop(schedule)
+            if self._stop.wait(max(0, due - time.monotonic())):
+                break
+            try:
+                self.poll_org(org_id)
+            except Exception:  # Keep monitoring the other organizations
+                self.stats['errors'] += 1
+            polls += 1
+            if max_polls is not None and polls >= max_polls:
+                break
+            heapq.heappush(
+                schedule, (time.monotonic() + self._intervals[org_id],
+                           org_id))
+
+    def stop(self):
+        """Stop run()."""
+        self._stop.set()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+"""Dry-run planner Module.
+
+This module estimates a bulk provisioning or teardown job before it's run:
+the number of Meraki dashboard API reads and writes per organization and the
+wall time under the per-organization rate limit and the concurrency. The job
+is resolved against the cached inventory (see the inventory module), so no
+write is ever sent while planning.
+"""
+import heapq
+from utilities import inventory
+from utilities import ratelimit
+from utilities import utils
+
+DEFAULT_LATENCY = 0.3  # Estimated seconds per API call
+
+
+def plan_job(orgs: list, job: list,
+             net_inventory: inventory.NetworkInventory,
+             orgs_cached: bool = True) -> dict:
+    """Resolve a bulk job into the API calls it would send.
+
+    - orgs (list): organizations list, see utils.init_dashboard_session()
+    - job (list): the job's rows, each a dict() with the 'organization'
+      name, the 'action' ('create' or 'delete') and the network 'name'.
+      The 'create' rows also have the network 'type' and optional 'tags'.
+      The 'delete' rows can have the network 'type' to tell a combined and
+      a standalone network of the same name apart.
+    - net_inventory (inventory.NetworkInventory object): networks cache,
+      the networks lists are fetched (reads only) if not cached.
+    - orgs_cached (bool): whether the organizations list is already known.
+    -> Return a dict() of the 'organizations' plans (org_id -> dict() with
+       the 'name', 'reads', 'writes', 'creates', 'deletes' and 'skipped'
+       rows), the 'errors' of the rows which can't be resolved, and the
+       total 'reads' and 'writes'.
+    """
+    plans = dict()
+    errors = list()
+    rows = dict()
+    for i, row in enumerate(job):
+        try:
+            org = utils.filter_orgs(
+                orgs=orgs, org_name=row['organization'], unique_org=True)
+        except (UserWarning, ValueError) as err:
+            errors.append({'row': i, 'error': str(err)})
+            continue
+        rows.setdefault(org['id'], (org, []))[1].append((i, row))
+
+    for org_id, (org, org_rows) in rows.items():
+        cached = net_inventory.is_cached(org_id)
+        org_networks = net_inventory.get_networks(org_id)
+        creates = [(i, row) for i, row in org_rows
+                   if row['action'] == 'create']
+        deletes = [(i, row) for i, row in org_rows
+                   if row['action'] == 'delete']
+        conflicts = utils.check_name_conflicts(
+            org_networks, [row for _, row in creates])
+        skipped = [
+            {'row': creates[c['index']][0], 'name': c['name'],
+             'reason': 'exists' if 'network' in c else 'duplicate'}
+            for c in conflicts
+            ]
+        delete_ids = list()
+        for i, row in deletes:
+            if row.get('type'):
+                match = utils.get_networks(
+                    org_networks, row['name'],
+                    net_type=2 if len(row['type'].split()) > 1 else 1)
+                matches = [match] if match is not None else []
+            else:
+                matches = utils.get_networks(org_networks, row['name'])
+            if not matches:
+                skipped.append(
+                    {'row': i, 'name': row['name'], 'reason': 'missing'})
+            elif len(matches) > 1:  # Combined and standalone, type needed
+                skipped.append(
+                    {'row': i, 'name': row['name'], 'reason': 'ambiguous'})
+            else:
+                delete_ids.append(matches[0]['id'])
+        n_creates = len(creates) - len(conflicts)
+        plans[org_id] = {
+            'name': org['name'],
+            'reads': 0 if cached else 1,  # getOrganizationNetworks
+            'writes': n_creates + len(delete_ids),
+            'creates': n_creates,
+            'deletes': len(delete_ids),
+            'skipped': skipped
+            }
+    return {
+        'organizations': plans,
+        'errors': errors,
+        'reads': sum(p['reads'] for p in plans.values()) + (
+            0 if orgs_cached else 1),  # getOrganizations
+        'writes': sum(p['writes'] for p in plans.values())
+        }
+
+
+def simulate(org_calls: dict, concurrency: int = 8,
+             rate: float = ratelimit.ORG_RATE_LIMIT,
+             global_rate: float = None,
+             latency: float = DEFAULT_LATENCY) -> float:
+    """Simulate the scheduling of the API calls.
+    ** Note: the calls are interleaved across the organizations, each call
+    starts at the earliest time a worker is free and its organization's
+    rate limit (and the global rate limit, if any) allows it.
+
+    - org_calls (dict): org_id -> number of API calls.
+    - concurrency (integer): number of concurrent workers.
+    - rate (float): calls per second per organization.
+    - global_rate (float): calls per second across all the organizations.
+    - latency (float): seconds per API call.
+    -> Return the estimated wall time in seconds.
+    """
+    workers = [0.0] * max(1, concurrency)
+    org_slots = dict.fromkeys(org_calls, 0.0)
+    global_slot = 0.0
+    remaining = dict(org_calls)
+    end = 0.0
+    while remaining:
+        for org_id in list(remaining):
+            free = heapq.heappop(workers)
+            start = max(free, org_slots[org_id], global_slot)
+            org_slots[org_id] = start + 1 / rate
+            if global_rate:
+                global_slot = start + 1 / global_rate
+            heapq.heappush(workers, start + latency)
+            end = max(end, start + latency)
+            remaining[org_id] -= 1
+            if remaining[org_id] <= 0:
+                del remaining[org_id]
+    return end
+
+
+def estimate(plan: dict, **options) -> float:
+    """Estimate the wall time of a plan, see simulate() for the options."""
+    org_calls = {
+        org_id: org_plan['reads'] + org_plan['writes']
+        for org_id, org_plan in plan['organizations'].items()
+        if org_plan['reads'] + org_plan['writes']
+        }
+    seconds = simulate(org_calls, **options)
+    org_reads = sum(p['reads'] for p in plan['organizations'].values())
+    if plan['reads'] > org_reads:  # getOrganizations runs first
+        seconds += options.get('latency', DEFAULT_LATENCY)
+    return seconds
+
+
+def format_plan(plan: dict, **options) -> str:
+    """Format a plan and its wall time estimate, see simulate() for the
+    options.
+    """
+    lines = [f"{'organization':<40} {'reads':>6} {'writes':>7} "
+             f"{'creates':>8} {'deletes':>8} {'skipped':>8}"]
+    for org_plan in plan['organizations'].values():
+        lines.append(
+            f"{org_plan['name'][:40]:<40} {org_plan['reads']:>6} "
+            f"{org_plan['writes']:>7} {org_plan['creates']:>8} "
+            f"{org_plan['deletes']:>8} {len(org_plan['skipped']):>8}")
+    for org_plan in plan['organizations'].values():
+        for skip in org_plan['skipped']:
+            lines.append(
+                f"-> Skipped row {skip['row']} '{skip['name']}' "
+                f"({skip['reason']}) in '{org_plan['name']}'")
+    for error in plan['errors']:
+        lines.append(f"-> Row {error['row']}: {error['error']}")
+    lines.append(
+        f"Total: {plan['reads']} reads, {plan['writes']} writes, "
+        f"estimated {estimate(plan, **options):.1f} seconds "
+        '(dry run, no writes were sent)')
+    return '\n'.join(lines)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""Prefetch Module.
+
+This module defines the Prefetcher class which sends the Meraki dashboard API
+requests on worker threads while the user is still being prompted by the
+userinputcli module, so the results are ready by the time they're needed.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Prefetcher:
+    """Run named API calls in the background.
+
+    - max_workers (integer): number of worker threads.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='prefetch')
+        self._futures = dict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def submit(self, name: str, func, *args, **kwargs):
+        """Start func(*args, **kwargs) on a worker thread.
+        ** Note: a previous prefetch of the same name is replaced.
+
+        - name (string): name used to get the result.
+        - func (callable): the function sending the API request.
+        """
+        previous = self._futures.get(name)
+        if previous is not None:
+            previous.cancel()
+        self._futures[name] = self._executor.submit(func, *args, **kwargs)
+
+    def result(self, name: str, timeout: float = None):
+        """Wait for a prefetch and get its result.
+
+        - name (string): name of the prefetch.
+        - timeout (float): maximum seconds to wait, None to wait until done.
+        -> Return the result of the prefetched call.
+        -> Raise the exception raised by the prefetched call.
+        -> Raise KeyError if nothing was prefetched with the provided name.
+        """
+        return self._futures[name].result(timeout=timeout)
+
+    def shutdown(self):
+        """Cancel the pending prefetches and release the worker threads."""
+        for future in self._futures.values():
+            future.cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""Rate limit Module.
+
+This module defines the rate limiters which keep the Meraki dashboard API
+calls within the per-organization rate limit. Each call is given the next
+free slot of its organization, spaced 1/rate seconds apart, and the caller
+sleeps until its slot starts.
+
+- RateLimiter: shared by the threads of a single process.
+- SharedRateLimiter: shared by the processes of a process pool. The slots
+  live in shared memory, so the organization's budget still holds however
+  the work is spread across the processes.
+"""
+import multiprocessing
+import threading
+import time
+
+# Meraki dashboard API rate limit: calls per second per organization
+ORG_RATE_LIMIT = 5
+
+
+class RateLimiter:
+    """Per-key rate limiter shared by threads.
+
+    - rate (float): calls per second per key, e.g. per organization ID.
+    - global_rate (float): calls per second across all keys, if limited.
+    """
+
+    def __init__(self, rate: float = ORG_RATE_LIMIT,
+                 global_rate: float = None):
+        self._interval = 1 / rate
+        self._global_interval = 1 / global_rate if global_rate else 0
+        self._lock = threading.Lock()
+        self._slots = dict()
+        self._global_slot = 0.0
+
+    def reserve(self, key) -> float:
+        """Reserve the next free slot of a key without waiting.
+
+        -> Return the number of seconds until the slot starts.
+        """
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._slots.get(key, 0.0))
+            if self._global_interval:
+                slot = max(slot, self._global_slot)
+                self._global_slot = slot + self._global_interval
+            self._slots[key] = slot + self._interval
+        return slot - now
+
+    def acquire(self, key):
+        """Wait for the next free slot of a key."""
+        delay = self.reserve(key)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class SharedRateLimiter:
+    """Per-key rate limiter shared by processes.
+    ** Note: the keys need to be known up front, and the limiter needs to be
+    passed to the worker processes when they're started (e.g. via the
+    initializer of a process pool).
+
+    - keys (list): the keys to be limited, e.g. organization IDs.
+    - rate (float): calls per second per key.
+    - global_rate (float): calls per second across all keys, if limited.
+    - mp_context: multiprocessing context used to allocate shared memory.
+    """
+
+    def __init__(self, keys: list, rate: float = ORG_RATE_LIMIT,
+                 global_rate: float = None, mp_context=None):
+        mp_context = mp_context or multiprocessing.get_context()
+        self._index = {key: i for i, key in enumerate(keys)}
+        self._interval = 1 / rate
+        self._global_interval = 1 / global_rate if global_rate else 0
+        # One slot per key, plus the global slot at the end
+        self._slots = mp_context.Array('d', len(self._index) + 1)
+
+    def reserve(self, key) -> float:
+        """Reserve the next free slot of a key without waiting.
+
+        -> Return the number of seconds until the slot starts.
+        -> Raise KeyError if the key wasn't provided up front.
+        """
+        i = self._index[key]
+        with self._slots.get_lock():
+            now = time.time()
+            slot = max(now, self._slots[i])
+            if self._global_interval:
+                slot = max(slot, self._slots[-1])
+                self._slots[-1] = slot + self._global_interval
+            self._slots[i] = slot + self._interval
+        return slot - now
+
+    def acquire(self, key):
+        """Wait for the next free slot of a key."""
+        delay = self.reserve(key)
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""Sharded executor Module.
+
+This module runs a per-organization task on a pool of processes, so the JSON
+parsing and the validation of very large accounts (hundreds of organizations,
+tens of thousands of networks) are spread across the CPU cores instead of
+being bound to a single Python process.
+
+- The work is sharded by organization: one task per organization ID.
+- The worker processes share a ratelimit.SharedRateLimiter, so the
+  per-organization budget holds across all the processes.
+- The results are streamed back to the parent process as soon as each
+  organization's task is completed.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from utilities import ratelimit
+
+_LIMITER = None  # The worker process' shared rate limiter
+
+
+def _init_worker(limiter: ratelimit.SharedRateLimiter):
+    """Keep the shared rate limiter in the worker process."""
+    global _LIMITER
+    _LIMITER = limiter
+
+
+def _run_shard(task, org_id: str):
+    """Run the task of an organization in the worker process."""
+    return task(org_id, _LIMITER)
+
+
+def run_sharded(task, org_ids: list, max_workers: int = None,
+                rate: float = ratelimit.ORG_RATE_LIMIT,
+                global_rate: float = None, mp_context=None):
+    """Run a task per organization on a pool of processes.
+
+    - task (callable): a module-level function task(org_id, limiter) which
+      calls limiter.acquire(org_id) before each API call and returns a
+      picklable result.
+    - org_ids (list): the organization IDs, one shard each.
+    - max_workers (integer): number of processes, default: CPU count.
+    - rate (float): calls per second per organization.
+    - global_rate (float): calls per second across all the organizations,
+      e.g. the per source IP limit, if limited.
+    - mp_context: multiprocessing context, default: the platform default.
+    -> Yield a tuple of (org_id, result, error) per organization as soon as
+       its task is completed. error is the exception raised by the task,
+       or None.
+    """
+    mp_context = mp_context or multiprocessing.get_context()
+    limiter = ratelimit.SharedRateLimiter(
+        keys=org_ids, rate=rate, global_rate=global_rate,
+        mp_context=mp_context)
+    with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=mp_context,
+            initializer=_init_worker, initargs=(limiter,)) as pool:
+        futures = {
+            pool.submit(_run_shard, task, org_id): org_id
+            for org_id in org_ids
+            }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as err:  # Returned to the parent to aggregate
+                yield futures[future], None, err
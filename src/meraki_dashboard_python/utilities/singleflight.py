@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""Single-flight Module.
+
+This module defines the SingleFlight class which coalesces identical
+in-flight requests to the Meraki dashboard API. While one request for a given
+endpoint, parameters and API key is in flight, the later callers wait on its
+result instead of sending a duplicate request and using up another slot of
+the organization's rate limit.
+"""
+import hashlib
+import json
+import threading
+
+
+class _Call:
+    """An in-flight call shared by the leader and its waiters."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce identical in-flight calls.
+
+    - The first caller of a key (the leader) executes the call.
+    - Any caller of the same key while the call is in flight waits for the
+      leader and receives the same result, or the same raised exception.
+    - Once the call completes, the key is released so the next caller issues
+      a fresh request. Nothing is cached beyond the lifetime of the call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = dict()
+        self._stats = dict()
+
+    def do(self, key: tuple, func, *args, **kwargs):
+        """Execute func(*args, **kwargs) once per in-flight key.
+
+        - key (tuple): request key, see request_key(). The first item of the
+          key is used as the endpoint name in the stats.
+        - func (callable): the function sending the request.
+        -> Return the result of the leader's call.
+        -> Raise the exception raised by the leader's call.
+        """
+        endpoint = key[0]
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, {'calls': 0, 'hits': 0})
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                stats['calls'] += 1
+                leader = True
+            else:
+                stats['hits'] += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> dict:
+        """Get the dedup hit counts.
+
+        -> Return a dict() including the total number of requests sent
+           ('calls'), the number of requests saved by coalescing ('hits') and
+           the same counters per endpoint ('endpoints').
+        """
+        with self._lock:
+            endpoints = {k: dict(v) for k, v in self._stats.items()}
+        return {
+            'calls': sum(v['calls'] for v in endpoints.values()),
+            'hits': sum(v['hits'] for v in endpoints.values()),
+            'endpoints': endpoints
+            }
+
+    def reset_stats(self):
+        """Reset the dedup hit counts."""
+        with self._lock:
+            self._stats = dict()
+
+
+def request_key(endpoint: str, params=None, auth: str = None,
+                base_url: str = None) -> tuple:
+    """Build a hashable key of a request.
+
+    ** Note: the API key is hashed so it's never kept in the key itself.
+
+    - endpoint (string): endpoint name, e.g. 'getOrganizations'
+    - params: any JSON serializable request parameters.
+    - auth (string): API key used to send the request.
+    - base_url (string): API base URL the request is sent to, so sessions
+      with the same API key but another server or API version (e.g. a
+      replayed or stand-in session) don't share their requests.
+    -> Return a tuple of (endpoint, params, API key digest, base URL).
+    """
+    auth_digest = hashlib.sha256(str(auth).encode()).hexdigest()[:16]
+    return (
+        endpoint,
+        json.dumps(params, sort_keys=True, default=str),
+        auth_digest,
+        base_url)
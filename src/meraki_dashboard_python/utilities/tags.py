@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+"""Network tags Module.
+
+This module defines the TagIndex class, an inverted index of the network
+tags (tag -> network IDs) built from an organization's networks list, and the
+bulk tag operations which compute the minimal per-network tag updates and
+send them concurrently under the per-organization rate limit.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import meraki
+from utilities import ratelimit
+from utilities import utils
+
+
+def get_net_tags(network: dict) -> list:
+    """Get a network's tags.
+    ** Note: the API v0 returns the tags as a space-separated string and the
+    API v1 as a list.
+
+    -> Return the list of the network's tags.
+    """
+    tags = network.get('tags') or list()
+    return tags.split() if isinstance(tags, str) else list(tags)
+
+
+class TagIndex:
+    """Inverted index of the network tags.
+
+    - org_networks (list): an organization's networks list.
+    """
+
+    def __init__(self, org_networks: list):
+        self._index = dict()
+        self._network_ids = set()
+        for net in org_networks:
+            self._network_ids.add(net['id'])
+            for tag in get_net_tags(net):
+                self._index.setdefault(tag, set()).add(net['id'])
+
+    def tags(self) -> dict:
+        """Get the number of networks of each tag.
+
+        -> Return a dict() of tag -> number of networks.
+        """
+        return {tag: len(ids) for tag, ids in self._index.items()}
+
+    def networks(self, tag: str) -> set:
+        """Get the IDs of the networks having a tag."""
+        return set(self._index.get(tag, ()))
+
+    def query(self, all_of: list = (), any_of: list = (),
+              none_of: list = ()) -> set:
+        """Get the networks matching a tag query.
+
+        - all_of (list): the networks need to have all these tags (AND).
+        - any_of (list): the networks need to have one of these tags (OR).
+        - none_of (list): the networks can't have any of these tags (NOT).
+        -> Return the set of the matching network IDs. All the networks
+           match an empty query.
+        """
+        ids = set(self._network_ids)
+        for tag in all_of:
+            ids &= self._index.get(tag, set())
+        if any_of:
+            ids &= set().union(*(self._index.get(tag, ()) for tag in any_of))
+        for tag in none_of:
+            ids -= self._index.get(tag, set())
+        return ids
+
+
+def validate_new_tags(tags: list) -> list:
+    """Validate the tags to be added, before any update is sent.
+
+    - tags (list): tags to be added, each a single tag.
+    -> Return the tags if valid. Otherwise, raise ValueError.
+    """
+    for tag in tags:
+        if tag.split() != [tag]:  # Blank or more than one tag
+            raise ValueError(utils.TAGS_ERROR)
+        utils.validate_tags(tag)
+    return tags
+
+
+def plan_tag_changes(org_networks: list, add: list = (), remove: list = (),
+                     network_ids: set = None) -> list:
+    """Compute the minimal tag updates of the networks.
+    ** Note: a network is only updated if its tags actually change.
+
+    - org_networks (list): an organization's networks list.
+    - add (list): tags to be added.
+    - remove (list): tags to be removed.
+    - network_ids (set): IDs of the networks to be changed, e.g. the result
+      of TagIndex.query(). Default: all the networks.
+    -> Return a list of dict() with the 'networkId', the new 'tags' list,
+       and the tags actually 'added' and 'removed'.
+    -> Raise ValueError if a tag to be added is invalid.
+    """
+    validate_new_tags(add)
+    remove = set(remove)
+    changes = list()
+    for net in org_networks:
+        if network_ids is not None and net['id'] not in network_ids:
+            continue
+        tags = get_net_tags(net)
+        added = [tag for tag in dict.fromkeys(add)
+                 if tag not in tags and tag not in remove]
+        removed = [tag for tag in tags if tag in remove]
+        if added or removed:
+            changes.append({
+                'networkId': net['id'],
+                'tags': [tag for tag in tags if tag not in remove] + added,
+                'added': added,
+                'removed': removed
+                })
+    return changes
+
+
+def apply_tag_changes(dashboard: meraki.DashboardAPI, org_id: str,
+                      changes: list, limiter: ratelimit.RateLimiter = None,
+                      max_workers: int = 8) -> list:
+    """Send the tag updates concurrently under the rate limit.
+
+    - dashboard (meraki.DashboardAPI object): authenticated DashboardAPI
+      session.
+    - org_id (string): the networks' organization ID.
+    - changes (list): the tag updates, see plan_tag_changes()
+    - limiter (ratelimit.RateLimiter object): shared rate limiter, default:
+      a new limiter at ratelimit.ORG_RATE_LIMIT.
+    - max_workers (integer): number of concurrent updates.
+    -> Return a list of dict() with the 'networkId' and the 'error' message
+       of each update, None if successful.
+    -> Raise ValueError if a tag to be added is invalid, before any update
+       is sent.
+    """
+    for change in changes:
+        validate_new_tags(change['added'])
+    limiter = limiter or ratelimit.RateLimiter()
+
+    def update(change):
+        limiter.acquire(org_id)
+        try:
+            dashboard.networks.updateNetwork(
+                change['networkId'], tags=' '.join(change['tags']))
+        except meraki.APIError as err:
+            return {'networkId': change['networkId'], 'error': str(err)}
+        except Exception as err:  # Keep the other networks' results
+            return {'networkId': change['networkId'],
+                    'error': f'{type(err).__name__}: {err}'}
+        return {'networkId': change['networkId'], 'error': None}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(update, changes))
@@ -4,11 +4,15 @@ import os
 import re
 from typing import TypedDict, Tuple
 import meraki
+from utilities import singleflight
+from utilities import dashboardv1
+from utilities import cassette
 
 # Constant variables declaration
 API_KEY = os.environ['MERAKI_API_KEY_HH']
 # API_KEY = os.environ['MERAKI_API_KEY_SYD_TRAINING']
 BASE_URL = "https://api.meraki.com/api/v0"
+V1_BASE_URL = dashboardv1.V1_BASE_URL
 PRODUCT_TYPES = {
     'mx': 'appliance',
     'ms': 'switch',
@@ -22,6 +26,27 @@ timeZone (string): The timezone of the network.
 Refer to 'TZ' column in the table in en.wikipedia.org
 """
 DEFAULT_TIME_ZONE = 'Australia/NSW'
+DEVICE_CODES = [k.upper() for k in PRODUCT_TYPES]
+NET_TYPES = frozenset(PRODUCT_TYPES.values())
+# Validation rules, compiled once
+NET_NAME_INVALID_CHARS = re.compile(r'[~`!$%^&*()+={}\[\]|\\/:"\',<>?]')
+TAGS_INVALID_CHARS = re.compile(r'[~`!@#$%^&*()+={}\[\]|\\/:"\',<>?]')
+NET_TYPE_INVALID_CHARS = re.compile(r'[~`!@#$%^&*()\-_+={}\[\]|\\/:"\',<>?.]')
+NET_NAME_BLANK_ERROR = "Data Error: Network name can't be a blank value!"
+NET_NAME_ERROR = (
+    'Data Error: Network name can only contain letters, numbers, '
+    'spaces, and these characters [.@#_-].')
+TAGS_ERROR = (
+    'Data Error: Tags can contain only letters, numbers, dashes, '
+    'underscores, and periods!')
+DEVICE_CODE_BLANK_ERROR = "Data Error: Hardware type can't be a blank value!"
+NET_TYPE_ERROR = (
+    'Data Error: Network types contain invalid value. '
+    f'Valid network types are {list(PRODUCT_TYPES.values())}')
+NET_TYPE_CHARS_ERROR = (
+    'Data Error: Network types contain only alphbetical characters.')
+# Coalesce identical in-flight GET requests (see dedup_get)
+SINGLE_FLIGHT = singleflight.SingleFlight()
 
 
 def validate_net_name(net_name: str) -> str:
@@ -33,14 +58,10 @@ def validate_net_name(net_name: str) -> str:
     -> Return net_name if nework name is valid. Otherwise, raise ValueError.
     """
     if not net_name:
-        raise ValueError("Data Error: Network name can't be a blank value!")
-
-    invalid_chars_regex = re.compile(r'[~`!$%^&*()+={}\[\]|\\/:"\',<>?]')
-    if invalid_chars_regex.search(net_name) is None:
+        raise ValueError(NET_NAME_BLANK_ERROR)
+    if NET_NAME_INVALID_CHARS.search(net_name) is None:
         return net_name
-    raise ValueError(
-        'Data Error: Network name can only contain letters, numbers, '
-        'spaces, and these characters [.@#_-].')
+    raise ValueError(NET_NAME_ERROR)
 
 
 def validate_tags(tags: str) -> str:
@@ -51,12 +72,9 @@ def validate_tags(tags: str) -> str:
     - tags (string): a list of tags separated by space.
     -> Return the network tags if tags are valid. Otherwise, raise ValueError.
     """
-    invalid_chars_regex = re.compile(r'[~`!@#$%^&*()+={}\[\]|\\/:"\',<>?]')
-    if invalid_chars_regex.search(tags) is None:
+    if TAGS_INVALID_CHARS.search(tags) is None:
         return tags
-    raise ValueError(
-        'Data Error: Tags can contain only letters, numbers, dashes, '
-        'underscores, and periods!')
+    raise ValueError(TAGS_ERROR)
 
 
 def validate_device_code(device_code: str) -> str:
@@ -66,14 +84,14 @@ def validate_device_code(device_code: str) -> str:
     - device_code (string): device code
     -> Return device code in lower case if valid. Otherwise, raise ValueError.
     """
-    if not device_code.strip():
-        raise ValueError("Data Error: Hardware type can't be a blank value!")
-    if (device_code.strip()).lower() in PRODUCT_TYPES.keys():
-        return (device_code.strip()).lower()
+    code = device_code.strip().lower()
+    if not code:
+        raise ValueError(DEVICE_CODE_BLANK_ERROR)
+    if code in PRODUCT_TYPES:
+        return code
     raise ValueError(
         f"Data Error: Invalid device code '{device_code}'! "
-        'Valid device codes are '
-        f"{[k.upper() for k, v in PRODUCT_TYPES.items()]}.")
+        f'Valid device codes are {DEVICE_CODES}.')
 
 
 def validate_net_type(net_type: str) -> str:
@@ -93,18 +111,13 @@ def validate_net_type(net_type: str) -> str:
     -> Return a string value of the netowrk types.
     -> Raise ValueError if the network type is valid.
     """
-    invalid_chars_regex = re.compile(r'[~`!@#$%^&*()-_+={}\[\]|\\/:"\',<>?.]')
-    if invalid_chars_regex.search(net_type) is None:
+    if NET_TYPE_INVALID_CHARS.search(net_type) is None:
         net_types = net_type.split()
         for _type in net_types:
-            if _type not in PRODUCT_TYPES.values():
-                raise ValueError(
-                    'Data Error: Network types contain invalid value. '
-                    'Valid network types are '
-                    f"{[v for k, v in PRODUCT_TYPES.values()]}")
+            if _type not in NET_TYPES:
+                raise ValueError(NET_TYPE_ERROR)
         return ' '.join(net_types)
-    raise ValueError(
-        "Data Error: Network types contain only alphbetical characters.")
+    raise ValueError(NET_TYPE_CHARS_ERROR)
 
 
 def get_dict_values(dict_keys: list, a_dict: dict) -> list:
@@ -115,13 +128,46 @@ def get_dict_values(dict_keys: list, a_dict: dict) -> list:
     _ a_dict (dict): a dictionary to be filtered with a dict_list.
     -> Return a list of values from a_dict filltered by dict_keys.
     """
-    a_list = list()
-    for key in dict_keys:
-        a_list.append(next((v for k, v in a_dict.items() if k == key), None))
-    return a_list
+    return [a_dict.get(key) for key in dict_keys]
+
+
+def dedup_get(dashboard: meraki.DashboardAPI, endpoint: str,
+              *args, **kwargs):
+    """Send a GET request, coalescing identical in-flight requests.
+    ** Note: while a request for the same endpoint, parameters, API key and
+    base URL is in flight, the caller waits on its result instead of sending
+    a duplicate.
+
+    - dashboard (meraki.DashboardAPI object): DashboardAPI session.
+    - endpoint (string): '<section>.<operation>' of the DashboardAPI object,
+      e.g. 'organizations.getOrganizations'
+    - args, kwargs: the operation's parameters.
+    -> Return the response of the GET request.
+    """
+    section, operation = endpoint.split('.')
+    func = getattr(getattr(dashboard, section), operation)
+    session = getattr(dashboard, '_session', None)
+    auth = getattr(session, '_api_key', None)
+    key = singleflight.request_key(
+        endpoint=operation, params=[args, kwargs],
+        auth=auth if auth is not None else id(dashboard),
+        base_url=getattr(session, '_base_url', None))
+    return SINGLE_FLIGHT.do(key, func, *args, **kwargs)
+
+
+def get_dedup_stats() -> dict:
+    """Get the dedup hit counts of the coalesced GET requests.
+
+    -> Return a dict() including the number of requests sent ('calls'), the
+       number of rate-limited requests saved ('hits') and the counters per
+       endpoint ('endpoints').
+    """
+    return SINGLE_FLIGHT.stats()
 
 
-def init_dashboard_session(auth) -> TypedDict(
+def init_dashboard_session(auth, base_url: str = BASE_URL,
+                           record: str = None, replay: str = None,
+                           replay_speed: float = 1.0) -> TypedDict(
         'DashboardSession', {'dashboardAPI': meraki.DashboardAPI,
                              'organizations': list}):
     """Get the authenticated DashboardAPI session.
@@ -129,25 +175,48 @@ def init_dashboard_session(auth) -> TypedDict(
       Validate whitepsace characters and throwing Exception.
 
     - auth: authentication value
+    - base_url (string): API base URL.
+    - record (string): cassette file to record the session's traffic into,
+      with the API key redacted (see the cassette module).
+    - replay (string): cassette file to replay the session's traffic from,
+      instead of sending the requests.
+    - replay_speed (float): replay speed relative to the recorded timings,
+      0 to replay without waiting.
     -> Return a dict() including an the authenticated meraki.DashboardAPI
        object and the authorized organizations list if authenticated.
+       The session is closed with close_session().
     -> Raise ValueError if the API key is not authorised.
     """
     try:
         dashboard = meraki.DashboardAPI(
-            api_key=auth, base_url=BASE_URL, output_log=False,
+            api_key=auth, base_url=base_url, output_log=False,
             print_console=False)
-        orgs = dashboard.organizations.getOrganizations()
+        cassette.attach(
+            dashboard._session._req_session, record=record, replay=replay,
+            replay_speed=replay_speed)
+        orgs = dedup_get(dashboard, 'organizations.getOrganizations')
     except meraki.APIKeyError:
         pass
     except meraki.exceptions.APIError:
-        pass
+        close_session(dashboard)  # Close the cassette, if any
     else:
         return {'dashboardAPI': dashboard, 'organizations': orgs}
     raise ValueError(
         'Authentication Error: API key is not authorized!')
 
 
+def close_session(dashboard):
+    """Close a dashboard session's connections and its cassette, if any.
+
+    - dashboard (meraki.DashboardAPI or dashboardv1.DashboardV1 object):
+      the session, see init_dashboard_session() and init_v1_session()
+    """
+    req_session = getattr(dashboard, '_req_session', None)
+    if req_session is None:
+        req_session = dashboard._session._req_session
+    req_session.close()
+
+
 def filter_orgs(orgs: list, org_name: str,
                 unique_org: bool = False) -> Tuple[list, dict]:
     """Get a list of organizations filtered by an organization name.
@@ -188,7 +257,7 @@ def get_org_networks(dashboard: meraki.DashboardAPI, org_name: str) -> list:
     -> Return a list of networks belonging to a provided unique org_name.
     """
     try:
-        orgs = dashboard.organizations.getOrganizations()
+        orgs = dedup_get(dashboard, 'organizations.getOrganizations')
     except UnboundLocalError as err:
         print(
             '-> Meraki API key error: '
@@ -206,7 +275,8 @@ def get_org_networks(dashboard: meraki.DashboardAPI, org_name: str) -> list:
         except ValueError as err:
             print(f'-> {err}')
         else:
-            return dashboard.networks.getOrganizationNetworks(org['id'])
+            return dedup_get(
+                dashboard, 'networks.getOrganizationNetworks', org['id'])
 
 
 def get_networks(org_networks: list, net_name: str,
@@ -236,3 +306,101 @@ def get_networks(org_networks: list, net_name: str,
     if net_type == 0:  # Filter both combined and standalone network type
         return list(net for net in org_networks if net['name'] == net_name)
     return None
+
+
+def check_name_conflicts(org_networks: list, net_specs: list) -> list:
+    """Check the requested network names against an organization's networks.
+    ** Note: the network name is only unique within a combined or standalone
+    network type context (see get_networks), so the names are resolved
+    against a single (name, network type) index of org_networks.
+
+    - org_networks (list): an organization's networks list, fetched or cached
+    - net_specs (list): the requested networks, each a dict() with the 'name'
+      and the 'type' (network types separated by space) of the network.
+    -> Return a list of conflicts, each a dict() with the 'index' and 'name'
+       of the conflicting spec, and either the 'network' which already exists
+       or the index of the previous spec it duplicates ('duplicateOf').
+    """
+    index = {
+        (net['name'], 2 if len(net['productTypes']) > 1 else 1): net
+        for net in org_networks
+        }
+    requested = dict()
+    conflicts = list()
+    for i, spec in enumerate(net_specs):
+        key = (spec['name'], 2 if len(spec['type'].split()) > 1 else 1)
+        if key in index:
+            conflicts.append(
+                {'index': i, 'name': spec['name'], 'network': index[key]})
+        elif key in requested:
+            conflicts.append(
+                {'index': i, 'name': spec['name'],
+                 'duplicateOf': requested[key]})
+        else:
+            requested[key] = i
+    return conflicts
+
+
+def init_v1_session(auth, base_url: str = V1_BASE_URL, record: str = None,
+                    replay: str = None, replay_speed: float = 1.0
+                    ) -> TypedDict(
+        'DashboardV1Session', {'dashboardAPI': dashboardv1.DashboardV1,
+                               'organizations': list}):
+    """Get the authenticated Meraki dashboard API v1 session.
+
+    - auth: authentication value
+    - base_url (string): API v1 base URL.
+    - record, replay, replay_speed: see init_dashboard_session()
+    -> Return a dict() including the authenticated dashboardv1.DashboardV1
+       object and the authorized organizations list if authenticated.
+    -> Raise ValueError if the API key is not authorised.
+    """
+    try:
+        dashboard = dashboardv1.DashboardV1(
+            api_key=auth, base_url=base_url, single_flight=SINGLE_FLIGHT)
+        cassette.attach(
+            dashboard._req_session, record=record, replay=replay,
+            replay_speed=replay_speed)
+        orgs = dashboard.getOrganizations()
+    except meraki.APIKeyError:
+        pass
+    except meraki.exceptions.APIError:
+        close_session(dashboard)  # Close the cassette, if any
+    else:
+        return {'dashboardAPI': dashboard, 'organizations': orgs}
+    raise ValueError(
+        'Authentication Error: API key is not authorized!')
+
+
+def get_org_inventory(dashboard: dashboardv1.DashboardV1, org_name: str,
+                      sections: tuple = ('networks', 'devices',
+                                         'deviceStatuses',
+                                         'uplinkStatuses')) -> dict:
+    """Get an organization's inventory using the organization-wide endpoints.
+    ** Note: organization name needs to be unique. Each section takes a few
+    paginated calls for the whole organization instead of one call per
+    network.
+
+    - dashboard (dashboardv1.DashboardV1 object): authenticated API v1
+      session.
+    - org_name (string): organization name
+    - sections (tuple): inventory sections to be fetched:
+        'networks', 'devices', 'deviceStatuses', 'uplinkStatuses'
+    -> Return a dict() including the organization and the requested
+       inventory sections.
+    -> Raise UserWarning if org_name is not unique.
+    -> Raise ValueError if org_name does not exist.
+    """
+    getters = {
+        'networks': dashboard.getOrganizationNetworks,
+        'devices': dashboard.getOrganizationDevices,
+        'deviceStatuses': dashboard.getOrganizationDevicesStatuses,
+        'uplinkStatuses': dashboard.getOrganizationUplinksStatuses
+        }
+    org = filter_orgs(
+        orgs=dashboard.getOrganizations(), org_name=org_name,
+        unique_org=True)
+    inventory = {'organization': org}
+    for section in sections:
+        inventory[section] = getters[section](org['id'])
+    return inventory
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+"""Webhook receiver Module.
+
+This module defines the WebhookReceiver class, a small asyncio HTTP server
+which accepts the Meraki dashboard alert/webhook payloads, verifies their
+shared secret and applies targeted invalidations to the local inventory
+(see the inventory module), so the inventory is kept fresh by events instead
+of re-polling getOrganizations/getOrganizationNetworks.
+"""
+import asyncio
+import hmac
+import json
+import urllib.error
+import urllib.request
+from utilities import inventory
+
+MAX_BODY_SIZE = 1024 * 1024  # Largest accepted payload in bytes
+REASONS = {
+    200: 'OK', 400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found',
+    405: 'Method Not Allowed', 413: 'Payload Too Large',
+    500: 'Internal Server Error'
+    }
+
+
+def invalidate_org(net_inventory: inventory.NetworkInventory,
+                   event: dict):
+    """Drop the cached networks of the event's organization."""
+    if event.get('organizationId'):  # Never drop all the organizations
+        net_inventory.invalidate(event['organizationId'])
+
+
+def invalidate_unknown_network(net_inventory: inventory.NetworkInventory,
+                               event: dict):
+    """Drop the cached networks of the event's organization if the event's
+    network isn't cached, e.g. a network created since the last fetch.
+    """
+    network_id = event.get('networkId')
+    if network_id and net_inventory.find_network(network_id) == (None, None):
+        invalidate_org(net_inventory, event)
+
+
+# Alert type ID -> inventory update
+DEFAULT_HANDLERS = {
+    'settings_changed': invalidate_org,
+    }
+
+
+class WebhookReceiver:
+    """Receive the Meraki dashboard webhooks.
+
+    - shared_secret (string): the shared secret of the webhook HTTP server
+      configured in the Meraki dashboard.
+    - net_inventory (inventory.NetworkInventory object): inventory updated
+      by the events.
+    - handlers (dict): alert type ID -> handler(net_inventory, event),
+      default: DEFAULT_HANDLERS. The events of the other alert types are
+      handled by invalidate_unknown_network().
+    - path (string): the URL path the webhooks are posted to.
+    """
+
+    def __init__(self, shared_secret: str,
+                 net_inventory: inventory.NetworkInventory = None,
+                 handlers: dict = None, path: str = '/'):
+        self._shared_secret = shared_secret
+        self._inventory = net_inventory
+        self._handlers = dict(
+            DEFAULT_HANDLERS if handlers is None else handlers)
+        self._path = path
+        self._listeners = list()
+        self._server = None
+        self.stats = {'accepted': 0, 'rejected': 0, 'errors': 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def add_listener(self, listener):
+        """Call listener(event) for each accepted event, e.g. to update
+        another local cache.
+        """
+        self._listeners.append(listener)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> int:
+        """Start the HTTP server.
+
+        -> Return the port the server is listening on.
+        """
+        self._server = await asyncio.start_server(
+            self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop the HTTP server."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def handle_event(self, event: dict) -> bool:
+        """Verify and apply an event.
+        ** Note: a failing handler or listener doesn't stop the other ones.
+
+        - event (dict): the decoded webhook payload.
+        -> Return True if the event is accepted. Otherwise, return False.
+        -> Raise the first error of the handler and the listeners, once
+           they've all been called.
+        """
+        secret = str(event.get('sharedSecret', ''))
+        if not hmac.compare_digest(secret.encode(),
+                                   self._shared_secret.encode()):
+            self.stats['rejected'] += 1
+            return False
+        self.stats['accepted'] += 1
+        calls = list()
+        if self._inventory is not None:
+            handler = self._handlers.get(
+                event.get('alertTypeId'), invalidate_unknown_network)
+            calls.append(lambda: handler(self._inventory, event))
+        calls.extend(
+            lambda listener=listener: listener(event)
+            for listener in self._listeners)
+        error = None
+        for call in calls:
+            try:
+                call()
+            except Exception as err:  # Keep calling the other listeners
+                self.stats['errors'] += 1
+                error = error or err
+        if error is not None:
+            raise error
+        return True
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        """Handle a single HTTP request."""
+        try:
+            try:
+                status = await self._handle_request(reader)
+            except Exception:  # A failing handler or listener
+                status = 500
+            body = json.dumps({'status': REASONS[status]}).encode()
+            writer.write(
+                f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+                'Content-Type: application/json\r\n'
+                f'Content-Length: {len(body)}\r\n'
+                'Connection: close\r\n\r\n'.encode() + body)
+            await writer.drain()
+        except ConnectionError:  # The client has gone away
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, reader: asyncio.StreamReader) -> int:
+        """Read a request and apply its event.
+
+        -> Return the HTTP status code of the response.
+        """
+        try:
+            request_line = (
+                await reader.readline()).decode('latin-1').split()
+            headers = dict()
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            if len(request_line) != 3:
+                return 400
+            method, path, _ = request_line
+            if path.split('?')[0] != self._path:
+                return 404
+            if method != 'POST':
+                return 405
+            length = int(headers.get('content-length', 0))
+            if length > MAX_BODY_SIZE:
+                return 413
+            event = json.loads(await reader.readexactly(max(0, length)))
+        except (asyncio.IncompleteReadError, ValueError):  # Malformed
+            return 400
+        if not isinstance(event, dict):
+            return 400
+        # The errors of the handler and the listeners are answered with 500
+        return 200 if self.handle_event(event) else 401
+
+
+def make_event(shared_secret: str, alert_type_id: str = 'settings_changed',
+               **fields) -> dict:
+    """Build a synthetic webhook payload, e.g. to test a receiver locally.
+
+    - shared_secret (string): shared secret of the receiver.
+    - alert_type_id (string): alert type ID, e.g. 'settings_changed'
+    - fields: any other payload fields, e.g. organizationId, networkId.
+    -> Return the webhook payload.
+    """
+    return {
+        'version': '0.1',
+        'sharedSecret': shared_secret,
+        'alertTypeId': alert_type_id,
+        'alertData': {},
+        **fields
+        }
+
+
+def post_event(url: str, event: dict, timeout: float = 5) -> int:
+    """Post a webhook payload to a receiver.
+
+    -> Return the HTTP status code of the response.
+    """
+    request = urllib.request.Request(
+        url, data=json.dumps(event).encode(), method='POST',
+        headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status
+    except urllib.error.HTTPError as err:
+        return err.code